@@ -42,6 +42,7 @@ user interface:
     supported
     execute
     reset
+    spawn
 
 Abstract methods and attributes
 -------------------------------
@@ -90,6 +91,7 @@ import abc
 import logging
 
 import autograd.numpy as np
+from numpy.random import SeedSequence, default_rng
 
 logging.getLogger()
 
@@ -110,15 +112,21 @@ class Device(abc.ABC):
         shots (int): number of circuit evaluations/random samples used to estimate
             expectation values of observables. For simulator devices, a value of 0 results
             in the exact expectation value being returned. Defaults to 0 if not specified.
+        seed (None, int, array[int], SeedSequence): seed of the random number generator
+            used for sampling. By default, fresh entropy is drawn from the operating system.
     """
     #pylint: disable=too-many-public-methods
     _capabilities = {} #: dict[str->*]: plugin capabilities
     _circuits = {}     #: dict[str->Circuit]: circuit templates associated with this API class
 
-    def __init__(self, wires=1, shots=0):
+    def __init__(self, wires=1, shots=0, seed=None):
         self.num_wires = wires
         self.shots = shots
 
+        #: SeedSequence: root of the random number streams of the device
+        self.seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+        self._rng = default_rng(self.seed_sequence)
+
         self._op_queue = None
         self._expval_queue = None
 
@@ -184,6 +192,21 @@ class Device(abc.ABC):
         """
         return cls._capabilities
 
+    def spawn(self, n):
+        """Spawn independent child seeds of the device random number generator.
+
+        For parallel execution, create the device of each worker using one of the
+        returned seeds, e.g., ``qml.device(dev.short_name, wires=2, shots=100, seed=s)``.
+        The resulting sampling streams are reproducible and statistically independent.
+
+        Args:
+            n (int): number of child seeds
+
+        Returns:
+            list[SeedSequence]: child seeds
+        """
+        return self.seed_sequence.spawn(n)
+
     def execute(self, queue, expectation):
         """Execute a queue of quantum operations on the device and then measure the given expectation values.
 
@@ -115,6 +115,7 @@ def qnode(device):
 
         # bind the jacobian method to the wrapped function
         wrapper.jacobian = qnode.jacobian
+        wrapper.batch = qnode.batch
 
         # bind the qnode attributes to the wrapped function
         wrapper.__dict__.update(qnode.__dict__)
@@ -181,6 +181,9 @@ class Operation(abc.ABC):
     * :attr:`~.Operation.grad_method`
     * :attr:`~.Operation.grad_recipe`
 
+    Operations may also provide a :meth:`~.Operation.decomposition`
+    into other operations, which is used on devices that do not support them.
+
     Args:
         args (tuple[float, int, array, Variable]): operation parameters
 
@@ -250,6 +253,36 @@ class Operation(abc.ABC):
         """Setter for the grad_recipe property"""
         self._grad_recipe = value
 
+    @property
+    def hyperparameters(self):
+        """Non-numeric settings of the operation, which are not parameters.
+
+        They are passed to :meth:`decomposition` as keyword arguments.
+
+        Returns:
+            dict[str, object]: settings by keyword
+        """
+        return {}
+
+    @staticmethod
+    def decomposition(*params, wires):
+        """Decomposition of the operation into other operations.
+
+        Devices that do not support the operation execute the decomposition instead.
+        Operations with :attr:`hyperparameters` also receive them as keyword arguments.
+
+        Args:
+            params (tuple[float, int, array]): numerical parameter values
+            wires (Sequence[int]): wires the operation acts on
+
+        Returns:
+            list[Operation]: operations equivalent to this one, not queued
+
+        Raises:
+            NotImplementedError: the operation has no decomposition
+        """
+        raise NotImplementedError
+
     def __init__(self, *args, wires=None, do_queue=True):
         # pylint: disable=too-many-branches
         self.name = self.__class__.__name__   #: str: name of the operation
@@ -387,8 +420,17 @@ class Operation(abc.ABC):
         Returns:
             list[float]: parameter values
         """
+        def check(p):
+            """Check the value of a Variable, which may be a batch of values."""
+            if isinstance(p, np.ndarray) and p.ndim == 1:
+                # one value per batch element, see :meth:`.QNode.evaluate_batch`
+                for x in p:
+                    self.check_domain(x, True)
+                return p
+            return self.check_domain(p, True)
+
         temp = list(_flatten(self.params))
-        temp_val = [self.check_domain(x.val, True) if isinstance(x, Variable) else x for x in temp]
+        temp_val = [check(x.val) if isinstance(x, Variable) else x for x in temp]
         return _unflatten(temp_val, self.params)[0]
 
     def queue(self):
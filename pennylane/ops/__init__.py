@@ -18,7 +18,7 @@
 PennyLane supports a collection of built-in quantum operations,
 including both discrete-variable (DV) gates as used in the qubit model,
 and continuous-variable (CV) gates as used in the qumode model of quantum
-computation.
+computation, as well as noisy qubit channels.
 
 Here, we summarize the built-in operations supported by PennyLane, as well
 as the conventions chosen for their implementation.
@@ -41,7 +41,9 @@ as the conventions chosen for their implementation.
 
     ops/qubit
     ops/cv
+    ops/channel
 """
 
 from .cv import *
 from .qubit import *
+from .channel import *
@@ -0,0 +1,146 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+.. _channel_ops:
+
+Qubit noisy channels
+====================
+
+.. currentmodule:: pennylane.ops.channel
+
+**Module name:** :mod:`pennylane.ops.channel`
+
+This section contains the available built-in discrete-variable
+quantum channels supported by PennyLane, as well as their conventions.
+
+Channels are not unitary, and can therefore only be applied by
+devices simulating mixed states, such as :mod:`default.mixed <pennylane.plugins.default_mixed>`.
+
+Channels
+--------
+
+.. autosummary::
+    AmplitudeDamping
+    PhaseDamping
+    DepolarizingChannel
+
+
+Code details
+~~~~~~~~~~~~
+"""
+
+from pennylane.operation import Operation
+
+
+class AmplitudeDamping(Operation):
+    r"""AmplitudeDamping(gamma, wires)
+    Single-qubit amplitude damping channel.
+
+    Models the decay of the excited state :math:`\ket{1}` into the ground state
+    :math:`\ket{0}`, using the Kraus operators
+
+    .. math::
+        K_0 = \begin{bmatrix}
+                1 & 0 \\
+                0 & \sqrt{1-\gamma}
+            \end{bmatrix}, \qquad
+        K_1 = \begin{bmatrix}
+                0 & \sqrt{\gamma} \\
+                0 & 0
+            \end{bmatrix}.
+
+    **Details:**
+
+    * Number of wires: 1
+    * Number of parameters: 1
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        gamma (float): damping probability :math:`\gamma\in[0,1]`
+        wires (Sequence[int] or int): the wire the channel acts on
+    """
+    num_params = 1
+    num_wires = 1
+    par_domain = 'R'
+    grad_method = 'F'
+
+
+class PhaseDamping(Operation):
+    r"""PhaseDamping(gamma, wires)
+    Single-qubit phase damping (dephasing) channel.
+
+    Models the loss of coherence between :math:`\ket{0}` and :math:`\ket{1}`
+    without energy loss, using the Kraus operators
+
+    .. math::
+        K_0 = \begin{bmatrix}
+                1 & 0 \\
+                0 & \sqrt{1-\gamma}
+            \end{bmatrix}, \qquad
+        K_1 = \begin{bmatrix}
+                0 & 0 \\
+                0 & \sqrt{\gamma}
+            \end{bmatrix}.
+
+    **Details:**
+
+    * Number of wires: 1
+    * Number of parameters: 1
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        gamma (float): dephasing probability :math:`\gamma\in[0,1]`
+        wires (Sequence[int] or int): the wire the channel acts on
+    """
+    num_params = 1
+    num_wires = 1
+    par_domain = 'R'
+    grad_method = 'F'
+
+
+class DepolarizingChannel(Operation):
+    r"""DepolarizingChannel(p, wires)
+    Single-qubit depolarizing channel.
+
+    With probability :math:`p` one of the Pauli errors :math:`X`, :math:`Y`
+    or :math:`Z` is applied, each being equally likely. The Kraus operators are
+
+    .. math::
+        K_0 = \sqrt{1-p}\,I, \quad K_1 = \sqrt{p/3}\,X, \quad
+        K_2 = \sqrt{p/3}\,Y, \quad K_3 = \sqrt{p/3}\,Z.
+
+    **Details:**
+
+    * Number of wires: 1
+    * Number of parameters: 1
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        p (float): error probability :math:`p\in[0,1]`
+        wires (Sequence[int] or int): the wire the channel acts on
+    """
+    num_params = 1
+    num_wires = 1
+    par_domain = 'R'
+    grad_method = 'F'
+
+
+all_ops = [
+    AmplitudeDamping,
+    PhaseDamping,
+    DepolarizingChannel
+]
+
+
+__all__ = [cls.__name__ for cls in all_ops]
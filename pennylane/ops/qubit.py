@@ -40,7 +40,10 @@ Gates
     RZ
     PhaseShift
     Rot
+    PauliRot
     QubitUnitary
+    DiagonalCost
+    TimeEvolution
 
 
 State preparation
@@ -49,13 +52,20 @@ State preparation
 .. autosummary::
     BasisState
     QubitStateVector
+    AmplitudeEmbedding
 
 
 Code details
 ~~~~~~~~~~~~
 """
 
+import numbers
+from collections.abc import Sequence
+
+import numpy as np
+
 from pennylane.operation import Operation
+from pennylane.variable import Variable
 
 
 class Hadamard(Operation):
@@ -340,6 +350,82 @@ class Rot(Operation):
     grad_method = 'A'
 
 
+class PauliRot(Operation):
+    r"""PauliRot(theta, wires, pauli_word=None)
+    Rotation generated by a multi-qubit Pauli operator
+
+    .. math:: R_P(\theta) = e^{-i\theta P/2} = \cos(\theta/2)I - i\sin(\theta/2)P,
+
+    where :math:`P` is a tensor product of the Pauli operators given by ``pauli_word``,
+    one per wire. For example, ``pauli_word='ZZZ'`` yields a multi-qubit :math:`Z` rotation.
+
+    Devices that do not support this operation natively apply it using
+    basis changes, :class:`CNOT` gates and an :class:`RZ` rotation.
+
+    **Details:**
+
+    * Number of wires: Any
+    * Number of parameters: 1
+    * Gradient recipe: :math:`\frac{d}{d\theta}R_P(\theta) = \frac{1}{2}\left[R_P(\theta+\pi/2)+R_P(\theta-\pi/2)\right]`
+
+    Args:
+        theta (float): rotation angle :math:`\theta`
+        wires (Sequence[int] or int): the wire(s) the operation acts on
+
+    Keyword Args:
+        pauli_word (str): string of ``'I'``, ``'X'``, ``'Y'`` and ``'Z'`` characters,
+            one per wire. Defaults to :math:`Z` on all of the wires.
+    """
+    num_params = 1
+    num_wires = 0
+    par_domain = 'R'
+    grad_method = 'A'
+
+    def __init__(self, *args, wires=None, pauli_word=None, do_queue=True):
+        w = wires if wires is not None else args[-1]
+        num = len(w) if isinstance(w, Sequence) else 1
+        if pauli_word is None:
+            pauli_word = 'Z'*num
+
+        if len(pauli_word) != num or not set(pauli_word) <= set('IXYZ'):
+            raise ValueError("PauliRot: the Pauli word must consist of one of "
+                             "I, X, Y or Z per wire, got '{}'.".format(pauli_word))
+
+        self.pauli_word = pauli_word  #: str: Pauli operator of each wire
+        super().__init__(*args, wires=wires, do_queue=do_queue)
+
+    @property
+    def hyperparameters(self):
+        return {'pauli_word': self.pauli_word}
+
+    @staticmethod
+    def decomposition(theta, *, wires, pauli_word):
+        w = [wires[j] for j, p in enumerate(pauli_word) if p != 'I']
+        if not w:
+            # global phase
+            return []
+
+        # rotate each Pauli operator to Z
+        ops = []
+        for j, p in zip(wires, pauli_word):
+            if p == 'X':
+                ops.append(Hadamard(wires=[j], do_queue=False))
+            elif p == 'Y':
+                ops.append(RX(np.pi/2, wires=[j], do_queue=False))
+
+        # the parity of the wires is collected on the last one
+        ladder = [CNOT(wires=[w[j], w[j+1]], do_queue=False) for j in range(len(w)-1)]
+        ops += ladder + [RZ(theta, wires=[w[-1]], do_queue=False)]
+        ops += [CNOT(wires=op.wires, do_queue=False) for op in reversed(ladder)]
+
+        for j, p in zip(wires, pauli_word):
+            if p == 'X':
+                ops.append(Hadamard(wires=[j], do_queue=False))
+            elif p == 'Y':
+                ops.append(RX(-np.pi/2, wires=[j], do_queue=False))
+        return ops
+
+
 #=============================================================================
 # Arbitrary operations
 #=============================================================================
@@ -365,6 +451,115 @@ class QubitUnitary(Operation):
     grad_method = 'F'
 
 
+class _Evolution(Operation):
+    """Base class for evolutions under a Hamiltonian given by array parameters.
+
+    The first parameter is the evolution time, a real scalar that may be a
+    :class:`~.variable.Variable`; the remaining ones are arrays.
+    """
+    # pylint: disable=abstract-method
+    par_domain = 'A'
+    grad_method = 'F'
+
+    def __init__(self, *args, wires=None, do_queue=True):
+        self.name = self.__class__.__name__
+        params = args if wires is not None else args[:-1]
+        if len(params) == self.num_params:
+            # only the evolution time may be a scalar
+            for p in params[1:]:
+                super().check_domain(p)
+        super().__init__(*args, wires=wires, do_queue=do_queue)
+
+    def check_domain(self, p, flattened=False):
+        if not flattened and isinstance(p, (Variable, numbers.Real)):
+            # evolution time
+            return p
+        return super().check_domain(p, flattened)
+
+
+class DiagonalCost(_Evolution):
+    r"""DiagonalCost(gamma, coeffs, terms, wires)
+    Evolution under a cost Hamiltonian made of Pauli-Z terms.
+
+    .. math:: U_C(\gamma) = e^{-i\gamma C}, \qquad C = \sum_k c_k \prod_{j\in T_k} Z_j,
+
+    where the wire subset :math:`T_k` of term :math:`k` is given by the nonzero entries of
+    row :math:`k` of ``terms``. As all terms commute, :math:`C` is diagonal in the
+    computational basis, as used in the cost layers of QAOA.
+
+    Devices that do not support this operation natively apply each term using
+    :class:`CNOT` and :class:`RZ` gates.
+
+    **Details:**
+
+    * Number of wires: Any
+    * Number of parameters: 3
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        gamma (float): evolution time :math:`\gamma`
+        coeffs (array[float]): coefficients :math:`c_k` of the terms
+        terms (array[int]): array of 0 or 1 integers of shape ``(len(coeffs), len(wires))``,
+            marking the wires of each term
+        wires (Sequence[int] or int): the wire(s) the operation acts on
+    """
+    num_params = 3
+    num_wires = 0
+    par_domain = 'A'
+    grad_method = 'F'
+
+    @staticmethod
+    def decomposition(gamma, coeffs, terms, wires):
+        terms = np.asarray(terms)
+        ops = []
+        for c, term in zip(coeffs, terms):
+            w = [wires[j] for j in np.flatnonzero(term)]
+            if not w:
+                # global phase
+                continue
+
+            # the parity of the term wires is collected on the last one
+            ladder = [CNOT(wires=[w[j], w[j+1]], do_queue=False) for j in range(len(w)-1)]
+            ops += ladder + [RZ(2*gamma*c, wires=[w[-1]], do_queue=False)]
+            ops += [CNOT(wires=op.wires, do_queue=False) for op in reversed(ladder)]
+        return ops
+
+
+class TimeEvolution(_Evolution):
+    r"""TimeEvolution(t, H, wires)
+    Evolution under an arbitrary Hamiltonian
+
+    .. math:: U(t) = e^{-iHt} = V e^{-i\Lambda t}V^\dagger,
+
+    where :math:`H = V\Lambda V^\dagger` is the eigendecomposition of the Hermitian
+    generator. Simulators may cache the eigendecomposition of :math:`H`, so that
+    evaluating the evolution for many times :math:`t` is cheap.
+
+    Devices that do not support this operation natively apply it as a :class:`QubitUnitary`.
+
+    **Details:**
+
+    * Number of wires: Any
+    * Number of parameters: 2
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        t (float): evolution time :math:`t`
+        H (array[complex]): Hermitian matrix of size ``2**len(wires)``
+        wires (Sequence[int] or int): the wire(s) the operation acts on
+    """
+    num_params = 2
+    num_wires = 0
+    par_domain = 'A'
+    grad_method = 'F'
+
+    @staticmethod
+    def decomposition(t, H, wires):
+        w, V = np.linalg.eigh(H)
+        U = (V * np.exp(-1j*w*t)) @ V.conj().T
+        return [QubitUnitary(U, wires=wires, do_queue=False)]
+
+
 #=============================================================================
 # State preparation
 #=============================================================================
@@ -412,6 +607,105 @@ class QubitStateVector(Operation):
     grad_method = 'F'
 
 
+def _uniform_rotation(gate, alpha, controls, target):
+    r"""Decompose a uniformly controlled rotation into rotations and CNOTs.
+
+    The rotation angle applied to the target depends on the computational basis
+    state of the control wires, ``controls[b]`` corresponding to bit :math:`b` of the
+    index of ``alpha``. The decomposition uses the Gray code ordering of the control
+    states, requiring a single CNOT between consecutive rotations.
+
+    Args:
+        gate (type): rotation operation class
+        alpha (array[float]): rotation angles, one per control state
+        controls (Sequence[int]): control wires
+        target (int): target wire
+
+    Returns:
+        list[Operation]: decomposition
+    """
+    k = len(controls)
+    gray = np.arange(2**k) ^ (np.arange(2**k) >> 1)
+
+    # theta_i = 2^{-k} \sum_j (-1)^{j \cdot g_i} alpha_j
+    parity = np.array([[bin(j & g).count('1') % 2 for j in range(2**k)] for g in gray])
+    theta = ((-1)**parity @ alpha) / 2**k
+
+    ops = []
+    for i in range(2**k):
+        if theta[i] != 0:
+            ops.append(gate(theta[i], wires=[target], do_queue=False))
+        if k > 0:
+            # control bit flipped between consecutive Gray codes
+            b = int(np.log2(gray[i] ^ gray[(i+1) % 2**k]))
+            ops.append(CNOT(wires=[controls[b], target], do_queue=False))
+    return ops
+
+
+class AmplitudeEmbedding(Operation):
+    r"""AmplitudeEmbedding(features, wires)
+    Encodes a feature vector into the amplitudes of the state of the given wires.
+
+    The features are padded with zeros to length :math:`2^n`, where :math:`n` is
+    the number of wires, and normalized. As with other state preparations, the wires
+    must not have been acted on before.
+
+    Devices that do not support this operation natively use the decomposition
+    of Möttönen et al. into :class:`RY`, :class:`RZ` and :class:`CNOT` gates,
+    which prepares the state up to a global phase.
+
+    **Details:**
+
+    * Number of wires: Any
+    * Number of parameters: 1
+    * Gradient recipe: None (uses finite difference)
+
+    Args:
+        features (array[complex]): feature vector of length at most :math:`2^n`
+        wires (Sequence[int] or int): the wire(s) the operation acts on
+    """
+    num_params = 1
+    num_wires = 0
+    par_domain = 'A'
+    grad_method = 'F'
+
+    @staticmethod
+    def decomposition(features, wires):
+        n = len(wires)
+        features = np.asarray(features).ravel()
+        if features.shape[0] > 2**n:
+            raise ValueError('AmplitudeEmbedding requires at most 2**len(wires) features.')
+
+        a = np.zeros(2**n, dtype=complex)
+        a[:features.shape[0]] = features
+        norm = np.linalg.norm(a)
+        if norm == 0:
+            raise ValueError('AmplitudeEmbedding requires a nonzero feature vector.')
+        a /= norm
+
+        prob = np.abs(a)**2
+        omega = np.angle(a)
+        ops = []
+
+        # prepare the magnitudes, and then the relative phases of the amplitudes,
+        # starting from the most significant wire
+        for k in range(n, 0, -1):
+            p = prob.reshape(2**(n-k), 2, 2**(k-1))
+            num = p[:, 1, :].sum(axis=1)
+            den = p.sum(axis=(1, 2))
+            ratio = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+            alpha = 2*np.arcsin(np.sqrt(np.clip(ratio, 0, 1)))
+            ops += _uniform_rotation(RY, alpha, wires[:n-k][::-1], wires[n-k])
+
+        if not np.allclose(omega, 0):
+            for k in range(n, 0, -1):
+                w = omega.reshape(2**(n-k), 2, 2**(k-1))
+                alpha = (w[:, 1, :] - w[:, 0, :]).sum(axis=1) / 2**(k-1)
+                ops += _uniform_rotation(RZ, alpha, wires[:n-k][::-1], wires[n-k])
+
+        return ops
+
+
 all_ops = [
     Hadamard,
     PauliX,
@@ -425,9 +719,13 @@ all_ops = [
     RZ,
     PhaseShift,
     Rot,
+    PauliRot,
     BasisState,
     QubitStateVector,
-    QubitUnitary
+    QubitUnitary,
+    DiagonalCost,
+    TimeEvolution,
+    AmplitudeEmbedding
 ]
 
 
@@ -39,7 +39,9 @@ Auxillary functions
 
 .. autosummary::
     partitions
+    loop_hafnian
     fock_prob
+    fock_probabilities
 
 Gates and operations
 --------------------
@@ -89,14 +91,18 @@ Code details
 ^^^^^^^^^^^^
 """
 # pylint: disable=attribute-defined-outside-init
+import itertools
 import logging as log
+from functools import lru_cache
 
 import numpy as np
 
 from scipy.special import factorial as fac
+from scipy.special import comb
 
 import pennylane as qml
 from pennylane import Device
+from pennylane.utils import BoundedCache
 
 log.getLogger()
 
@@ -146,29 +152,98 @@ def partitions(s, include_singles=True):
                 yield ((item_partition),) + p
 
 
-def fock_prob(mu, cov, event, hbar=2.):
-    r"""Returns the probability of detection of a particular PNR detection event.
+def loop_hafnian(A, D=None, reps=None):
+    r"""Returns the loop hafnian of a symmetric matrix with repeated rows and columns.
+
+    Uses the power-trace formula of Bjorklund, Gupt and Quesada, where the
+    trace of each subset is computed from the eigenvalues of the corresponding
+    submatrix. Rows that are repeated are paired with themselves, so that the
+    sum runs over the multiplicities of each pair rather than over all subsets
+    of the expanded matrix.
 
     For more details, see:
 
-    * Kruse, R., Hamilton, C. S., Sansoni, L., Barkhofen, S., Silberhorn, C., & Jex, I.
-      "A detailed study of Gaussian Boson Sampling." `arXiv:1801.07488. (2018).
-      <https://arxiv.org/abs/1801.07488>`_
+    * Bjorklund, A., Gupt, B., & Quesada, N.
+      "A faster hafnian formula for complex matrices and its benchmarking on a supercomputer."
+      `arXiv:1805.12498. (2018). <https://arxiv.org/abs/1805.12498>`_
+
+    Args:
+        A (array): :math:`N\times N` symmetric matrix
+        D (array): length-:math:`N` vector of loop weights; if not provided,
+            the hafnian (no loops) is returned
+        reps (Sequence[int]): the number of times each row and column is repeated;
+            defaults to once each
+
+    Returns:
+        complex: the loop hafnian of the expanded matrix
+    """
+    # pylint: disable=too-many-locals
+    A = np.array(A, dtype=np.complex128)
+    N = len(A)
+    D = np.zeros(N, dtype=np.complex128) if D is None else np.array(D, dtype=np.complex128)
+    reps = np.ones(N, dtype=int) if reps is None else np.asarray(reps, dtype=int)
+
+    # pair each row with itself as often as possible,
+    # and pair up the remaining rows with odd multiplicity
+    pairs = [(i, i, r//2) for i, r in enumerate(reps) if r >= 2]
+    odd = [i for i, r in enumerate(reps) if r % 2]
+
+    if len(odd) % 2:
+        # an additional row with only a unit loop leaves the loop hafnian unchanged
+        A = np.pad(A, (0, 1), 'constant')
+        D = np.append(D, 1)
+        odd.append(N)
+
+    pairs += [(i, j, 1) for i, j in zip(odd[::2], odd[1::2])]
+    n = sum(p[2] for p in pairs)
+
+    if n == 0:
+        return 1.
+
+    k = np.arange(1, n+1)
+    haf = 0
+
+    for s in itertools.product(*[range(p[2]+1) for p in pairs]):
+        # the pairing matrix restricted to the chosen number of each pair
+        XS = np.zeros_like(A)
+        weight = (-1)**(n-sum(s))
+        for (i, j, r), m in zip(pairs, s):
+            XS[i, j] += m
+            XS[j, i] += m
+            weight *= comb(r, m, exact=True)
+
+        # power traces and loop contributions of the generating function
+        ev = np.linalg.eigvals(A @ XS)
+        p = np.sum(ev**k[:, None], axis=1)/(2*k)
+
+        v = XS @ D
+        for i in range(n):
+            p[i] += D @ v/2
+            v = XS @ (A @ v)
+
+        # coefficient of x^n in exp(sum_k p_k x^k)
+        f = np.zeros(n+1, dtype=np.complex128)
+        f[0] = 1
+        for i in range(1, n+1):
+            f[i] = np.sum(k[:i]*p[:i]*f[i-1::-1])/i
+
+        haf += weight*f[n]
+
+    return haf
 
-    * Hamilton, C. S., Kruse, R., Sansoni, L., Barkhofen, S., Silberhorn, C., & Jex, I.
-      "Gaussian boson sampling." `Physical review letters, 119(17), 170501. (2017).
-      <https://journals.aps.org/prl/abstract/10.1103/PhysRevLett.119.170501>`_
+
+def _hamilton(mu, cov, hbar=2.):
+    r"""Returns the quantities defining the Fock representation of a Gaussian state.
 
     Args:
         mu (array): length-:math:`2N` means vector
         cov (array): :math:`2N\times 2N` covariance matrix
-        event (array): length-:math:`N` array of non-negative integers representing the
-            PNR detection event of the multi-mode system.
         hbar (float): (default 2) the value of :math:`\hbar` in the commutation
-            relation :math:`[\x,\p]=i\hbar`.
+            relation :math:`[\x,\p]=i\hbar`
 
     Returns:
-        float: probability of detecting the event
+        tuple[complex, array, array]: the vacuum probability, Hamilton's
+        :math:`A` matrix, and the vector :math:`\gamma` of loop weights
     """
     # number of modes
     N = len(mu)//2
@@ -198,32 +273,153 @@ def fock_prob(mu, cov, event, hbar=2.):
 
     prefactor = np.exp(-beta @ Qinv @ beta.conj()/2)
 
-    if np.all(np.array(event) == 0):
-        # all PNRs detect the vacuum state
-        return (prefactor*sqrt_Qdet).real/np.prod(fac(event))
-
     # the matrix X_n = [[0, I_n], [I_n, 0]]
     O = np.zeros_like(I)
     X = np.block([[O, I], [I, O]])
 
     gamma = X @ Qinv.conj() @ beta
 
-    # For each mode, repeat the mode number event[i] times
-    ind = [i for sublist in [[idx]*j for idx, j in enumerate(event)] for i in sublist]
-    # extend the indices for xp-ordering of the Gaussian state
-    ind += [i+N for i in ind]
+    # calculate Hamilton's A matrix: A = X.(I-Q^{-1})*
+    A = X @ (np.identity(2*N)-Qinv).conj()
+
+    return prefactor*sqrt_Qdet, A, gamma
+
+
+def fock_prob(mu, cov, event, hbar=2.):
+    r"""Returns the probability of detection of a particular PNR detection event.
+
+    The probability is proportional to the loop hafnian of Hamilton's
+    :math:`A` matrix, with the rows and columns of each mode repeated
+    according to the event (see :func:`loop_hafnian`). For pure states,
+    :math:`A=B\oplus B^*`, and only the hafnian of :math:`B` is required.
+
+    For more details, see:
+
+    * Kruse, R., Hamilton, C. S., Sansoni, L., Barkhofen, S., Silberhorn, C., & Jex, I.
+      "A detailed study of Gaussian Boson Sampling." `arXiv:1801.07488. (2018).
+      <https://arxiv.org/abs/1801.07488>`_
+
+    * Hamilton, C. S., Kruse, R., Sansoni, L., Barkhofen, S., Silberhorn, C., & Jex, I.
+      "Gaussian boson sampling." `Physical review letters, 119(17), 170501. (2017).
+      <https://journals.aps.org/prl/abstract/10.1103/PhysRevLett.119.170501>`_
+
+    Args:
+        mu (array): length-:math:`2N` means vector
+        cov (array): :math:`2N\times 2N` covariance matrix
+        event (array): length-:math:`N` array of non-negative integers representing the
+            PNR detection event of the multi-mode system.
+        hbar (float): (default 2) the value of :math:`\hbar` in the commutation
+            relation :math:`[\x,\p]=i\hbar`.
 
-    if np.linalg.norm(beta) < tolerance:
+    Returns:
+        float: probability of detecting the event
+    """
+    return _fock_prob(*_hamilton(mu, cov, hbar), event)
+
+
+def _fock_prob(T, A, gamma, event):
+    """Returns the probability of a PNR detection event from the output of :func:`_hamilton`."""
+    N = len(A)//2
+
+    if np.all(np.array(event) == 0):
+        # all PNRs detect the vacuum state
+        return T.real
+
+    if np.allclose(gamma, 0, atol=tolerance):
         # state has no displacement
-        part = partitions(ind, include_singles=False)
+        gamma = None
+
+    if np.allclose(A[:N, N:], 0, atol=tolerance):
+        # pure state: A = B (+) B^*, and the loop hafnian factorizes
+        summation = np.abs(loop_hafnian(A[:N, :N], None if gamma is None else gamma[:N], event))**2
     else:
-        part = partitions(ind, include_singles=True)
+        summation = loop_hafnian(A, gamma, np.concatenate([event, event]))
 
-    # calculate Hamilton's A matrix: A = X.(I-Q^{-1})*
-    A = X @ (np.identity(2*N)-Qinv).conj()
-    summation = np.sum([np.prod([gamma[i[0]] if len(i) == 1 else A[i] for i in p]) for p in part])
+    return (T*summation).real/np.prod(fac(event))
+
+
+def fock_probabilities(mu, cov, cutoff, hbar=2.):
+    r"""Returns the photon-number distribution of a Gaussian state up to a cutoff.
+
+    Rather than evaluating a loop hafnian per event, the (normalized) loop
+    hafnians of all events are built up from their neighbours using
 
-    return (prefactor*sqrt_Qdet*summation).real/np.prod(fac(event))
+    .. math::
+        \text{lhaf}(A_{k+e_i}) = \gamma_i\,\text{lhaf}(A_k)
+        + \sum_j A_{ij}\,k_j\,\text{lhaf}(A_{k-e_j}),
+
+    where :math:`A_k` has row and column :math:`j` repeated :math:`k_j` times.
+    For mixed states, the recursion runs over the diagonal and off-diagonal
+    indices of the density matrix; for pure states, only over the amplitudes.
+
+    Args:
+        mu (array): length-:math:`2N` means vector
+        cov (array): :math:`2N\times 2N` covariance matrix
+        cutoff (int): the number of Fock states :math:`\ket{0},\dots,\ket{c-1}`
+            to return the probabilities for in each mode
+        hbar (float): (default 2) the value of :math:`\hbar` in the commutation
+            relation :math:`[\x,\p]=i\hbar`
+
+    Returns:
+        array: array of shape ``[cutoff]*N``, whose element ``[n_1,...,n_N]``
+        is the probability of detecting the event :math:`(n_1,\dots,n_N)`
+    """
+    return _fock_probabilities(*_hamilton(mu, cov, hbar), cutoff)
+
+
+def _fock_probabilities(T, A, gamma, cutoff):
+    """Returns the photon-number distribution from the output of :func:`_hamilton`."""
+    N = len(A)//2
+
+    pure = np.allclose(A[:N, N:], 0, atol=tolerance)
+    if pure:
+        A = A[:N, :N]
+        gamma = gamma[:N]
+
+    # H[k] = lhaf(A_k)/sqrt(k!)
+    H = np.zeros([cutoff]*len(A), dtype=np.complex128)
+    H.flat[0] = 1
+    sqrt = np.sqrt(np.arange(cutoff))
+
+    for k in itertools.islice(np.ndindex(*H.shape), 1, None):
+        # lower the last non-zero index
+        i = np.flatnonzero(k)[-1]
+        k = np.array(k)
+        k[i] -= 1
+
+        h = gamma[i]*H[tuple(k)]
+        for j in np.flatnonzero(k):
+            k[j] -= 1
+            h += A[i, j]*sqrt[k[j]+1]*H[tuple(k)]
+            k[j] += 1
+
+        k[i] += 1
+        H[tuple(k)] = h/sqrt[k[i]]
+
+    if pure:
+        return T.real*np.abs(H)**2
+
+    # the probabilities are the diagonal elements of the density matrix
+    ind = np.arange(cutoff**N)
+    return (T*H.reshape(cutoff**N, -1)[ind, ind]).real.reshape([cutoff]*N)
+
+
+def _stack_batch(fn, par, **kwargs):
+    """Evaluates a gate or state preparation function for each element of a batch of parameters.
+
+    Args:
+        fn (callable): function returning a symplectic matrix, or a means vector and
+            covariance matrix
+        par (Sequence): parameters, each a scalar or an array with one value per batch element
+        kwargs: additional keyword arguments passed to fn
+
+    Returns:
+        array or list[array]: the results stacked along a new leading batch dimension
+    """
+    res = [fn(*p, **kwargs) for p in zip(*np.broadcast_arrays(*par))]
+    if isinstance(res[0], (tuple, list)):
+        return [np.stack(r) for r in zip(*res)]
+    return np.stack(res)
 
 
 #========================================================
@@ -255,8 +451,9 @@ def displacement(state, wire, alpha, hbar=2):
         tuple: contains the vector of means and covariance matrix
     """
     mu = state[0]
-    mu[wire] += alpha.real*np.sqrt(2*hbar)
-    mu[wire+len(mu)//2] += alpha.imag*np.sqrt(2*hbar)
+    N = mu.shape[-1]//2
+    mu[..., wire] += alpha.real*np.sqrt(2*hbar)
+    mu[..., wire+N] += alpha.imag*np.sqrt(2*hbar)
     return mu, state[1]
 
 
@@ -372,23 +569,29 @@ def controlled_phase(s):
     return S
 
 
+_interferometers = BoundedCache(16)
+
+
 def interferometer(U):
-    """Interferometer
+    r"""Interferometer
 
     Args:
-        U (array): unitary matrix
+        U (array): :math:`N\times N` unitary matrix
 
     Returns:
-        array: symplectic transformation matrix
+        array: read-only :math:`2N\times 2N` symplectic transformation matrix,
+        in the :math:`(x_1,\dots,x_N,p_1,\dots,p_N)` ordering
     """
-    N = 2*len(U)
-    X = U.real
-    Y = U.imag
-    rows = np.arange(N).reshape(2, -1).T.flatten()
-    S = np.vstack([np.hstack([X, -Y]),
-                   np.hstack([Y, X])])[:, rows][rows]
+    U = np.asarray(U)
 
-    return S
+    def compute():
+        """symplectic matrix of U"""
+        X = U.real
+        Y = U.imag
+        return np.vstack([np.hstack([X, -Y]),
+                          np.hstack([Y, X])])
+
+    return _interferometers.get((U.tobytes(), U.shape, U.dtype.str), compute)
 
 #========================================================
 #  Arbitrary states and operators
@@ -542,16 +745,16 @@ def set_state(state, wire, mu, cov):
     """
     mu0 = state[0]
     cov0 = state[1]
-    N = len(mu0)//2
+    N = mu0.shape[-1]//2
 
     # insert the new state into the means vector
-    mu0[[wire, wire+N]] = mu
+    mu0[..., [wire, wire+N]] = mu
 
     # insert the new state into the covariance matrix
     ind = np.concatenate([np.array([wire]), np.array([wire])+N])
     rows = ind.reshape(-1, 1)
     cols = ind.reshape(1, -1)
-    cov0[rows, cols] = cov
+    cov0[..., rows, cols] = cov
 
     return mu0, cov0
 
@@ -612,37 +815,51 @@ def homodyne(phi=None):
     return _homodyne
 
 
+@lru_cache()
+def _xxpp_permutation(N):
+    """Returns the permutation from the (I, x1,p1, x2,p2, ...) ordering
+    to the (I, x1,x2,..., p1,p2...) ordering.
+
+    Args:
+        N (int): number of modes
+
+    Returns:
+        array[int]: the permutation, of length :math:`2N+1`
+    """
+    return np.concatenate([[0], np.arange(1, 2*N+1, 2), np.arange(2, 2*N+1, 2)])
+
+
 def poly_quad_expectations(mu, cov, wires, params, hbar=2.):
     r"""Calculates the expectation and variance for an arbitrary
     polynomial of quadrature operators.
 
     Args:
-        mu (array): length-2 vector of means
-        cov (array): :math:`2\times 2` covariance matrix
+        mu (array): length-:math:`2N` vector of means
+        cov (array): :math:`2N\times 2N` covariance matrix
         wires (Sequence[int]): wires to calculate the expectation for
         params (array): a :math:`(2N+1)\times (2N+1)` array containing the linear
             and quadratic coefficients of the quadrature operators
-            :math:`(\I, \x_0, \p_0, \x_1, \p_1,\dots)`
+            :math:`(\I, \x_0, \p_0, \x_1, \p_1,\dots)`, where mode :math:`k`
+            corresponds to ``wires[k]``
         hbar (float): (default 2) the value of :math:`\hbar` in the commutation
             relation :math:`[\x,\p]=i\hbar`
 
     Returns:
         tuple: the mean and variance of the quadrature-polynomial observable
     """
-    Q = params[0]
+    # pylint: disable=unused-argument
+    Q = np.asarray(params[0])
     N = len(mu)//2
 
-    # HACK, we need access to the Poly instance in order to expand the matrix!
-    op = qml.expval.PolyXP(Q, wires=wires, do_queue=False)
-    Q = op.heisenberg_obs(N)
+    # Q is expanded in the modes of the reduced state; convert
+    # to the (I, x1,x2,..., p1,p2...) ordering
+    perm = _xxpp_permutation(N)
 
     if Q.ndim == 1:
-        d = np.r_[Q[1::2], Q[2::2]]
+        d = Q[perm[1:]]
         return d.T @ mu + Q[0], d.T @ cov @ d
 
-    # convert to the (I, x1,x2,..., p1,p2...) ordering
-    M = np.vstack((Q[0:1, :], Q[1::2, :], Q[2::2, :]))
-    M = np.hstack((M[:, 0:1], M[:, 1::2], M[:, 2::2]))
+    M = Q[perm[:, np.newaxis], perm]
     d1 = M[1:, 0]
     d2 = M[0, 1:]
 
@@ -656,8 +873,9 @@ def poly_quad_expectations(mu, cov, wires, params, hbar=2.):
     ex = np.trace(A @ cov) + k2
     var = 2*np.trace(A @ cov @ A @ cov) + d2.T @ cov @ d2
 
-    modes = np.arange(2*N).reshape(2, -1).T
-    groenewald_correction = np.sum([np.linalg.det(hbar*A[:, m][n]) for m in modes for n in modes])
+    # 2x2 blocks of A coupling the quadratures of each pair of modes
+    blocks = A.reshape(2, N, 2, N).transpose(1, 3, 0, 2)
+    groenewald_correction = np.sum(np.linalg.det(hbar*blocks))
     var -= groenewald_correction
 
     return ex, var
@@ -705,9 +923,19 @@ class DefaultGaussian(Device):
     Args:
         wires (int): the number of modes to initialize the device in
         shots (int): How many times should the circuit be evaluated (or sampled) to estimate
-            the expectation values. 0 yields the exact result.
+            the expectation values. 0 yields the exact result. Quadrature expectations
+            are estimated from joint samples of all modes, available as :attr:`samples`
+            after execution.
         hbar (float): (default 2) the value of :math:`\hbar` in the commutation
             relation :math:`[\x,\p]=i\hbar`
+        seed (None, int, array[int], SeedSequence): seed of the random number generator used
+            for sampling. By default, fresh entropy is drawn from the operating system.
+        heisenberg (bool): If True, exact executions measuring only first- and second-order
+            observables propagate the observables backward through the trailing Gaussian
+            gates, instead of evolving the state of all modes (see :meth:`heisenberg_expval`).
+        fusion (int): Consecutive gates and displacements acting on at most this many modes
+            are multiplied into a single affine map before it is applied to the state,
+            so that the covariance matrix is updated once per fused block. 0 disables fusion.
     """
     name = 'Default Gaussian PennyLane plugin'
     short_name = 'default.gaussian'
@@ -742,58 +970,288 @@ class DefaultGaussian(Device):
         'Identity': identity
     }
 
+    _capabilities = {'batched': True}
+
+    # operations and observables whose parameters are arrays
+    _array_operations = {'Interferometer', 'GaussianState', 'PolyXP'}
+
+    # phase space angles of the quadrature expectations that are estimated from samples
+    _quadratures = {'X': 0, 'P': np.pi/2, 'Homodyne': None}
+
     _circuits = {}
 
-    def __init__(self, wires, *, shots=0, hbar=2):
-        super().__init__(wires, shots)
+    def __init__(self, wires, *, shots=0, hbar=2, seed=None, heisenberg=False, fusion=4):
+        super().__init__(wires, shots, seed=seed)
         self.eng = None
         self.hbar = hbar
+        self.heisenberg = heisenberg
+        self.fusion = fusion
+        #: None, tuple[list[int], array, array]: wires, symplectic matrix and displacement
+        #: of the gates fused so far, not yet applied to the state
+        self._fused = None
         self.reset()
 
+    def execute(self, queue, expectation):
+        # the Heisenberg representations of the operations assume hbar=2
+        if not self.heisenberg or self.shots != 0 or self.hbar != 2 \
+                or not all(getattr(e, 'ev_order', None) in (1, 2) for e in expectation) \
+                or any(self._batched(e.name, e.parameters) for e in expectation):
+            return super().execute(queue, expectation)
+
+        # the trailing Gaussian gates are absorbed into the observables,
+        # batched gates are applied to the (batched) state instead
+        k = len(queue)
+        while k > 0 and isinstance(queue[k-1], qml.operation.CVOperation) \
+                and queue[k-1].supports_heisenberg \
+                and not self._batched(queue[k-1].name, queue[k-1].parameters):
+            k -= 1
+
+        self.check_validity(queue, expectation)
+        self._op_queue = queue
+        self._expval_queue = expectation
+
+        with self.execution_context():
+            self.pre_apply()
+            for operation in queue[:k]:
+                self.apply(operation.name, operation.wires, operation.parameters)
+            self.post_apply()
+
+            expectations = [self.heisenberg_expval(e, queue[k:]) for e in expectation]
+
+            self._op_queue = None
+            self._expval_queue = None
+
+            return np.array(expectations)
+
+    def heisenberg_expval(self, expectation, gates):
+        r"""Evaluates an observable after a sequence of Gaussian gates in the Heisenberg picture.
+
+        The observable is transformed by the gates in reverse order, and
+        then evaluated in the current state. Only the wires the transformed
+        observable acts on are kept track of, so that each gate costs
+        :math:`O(k)` or :math:`O(k^2)` operations for first- and
+        second-order observables on :math:`k` wires.
+
+        Args:
+            expectation (~.CVExpectation): first- or second-order observable
+            gates (Sequence[~.CVOperation]): Gaussian gates applied after the current state
+
+        Returns:
+            float or array[float]: expectation value, or one per batch element
+            for batched states
+        """
+        q = np.array(expectation._heisenberg_rep(expectation.parameters), dtype=np.float64)
+        wires = list(expectation.wires)
+
+        for op in reversed(gates):
+            if not set(op.wires) & set(wires):
+                # the gate commutes with the observable
+                continue
+
+            new = [w for w in op.wires if w not in wires]
+            if new:
+                wires += new
+                q = np.pad(q, [(0, 2*len(new))]*q.ndim, 'constant')
+
+            # locations of (I, x_w, p_w, ...) of the gate in the basis of the observable
+            idx = [0] + [2*wires.index(w)+i for w in op.wires for i in (1, 2)]
+            U = op._heisenberg_rep(op.parameters)
+
+            if q.ndim == 1:
+                q[idx] = q[idx] @ U
+            else:
+                q[:, idx] = q[:, idx] @ U
+                q[idx, :] = U.T @ q[idx, :]
+
+        # means and covariances of (I, x_0, p_0, x_1, p_1, ...)
+        mu, cov = self.reduced_state(wires)
+        perm = np.arange(2*len(wires)).reshape(2, -1).T.flatten()
+        m = np.concatenate([np.ones(mu.shape[:-1] + (1,)), mu[..., perm]], axis=-1)
+
+        if q.ndim == 1:
+            return m @ q
+
+        return np.einsum('...i,ij,...j->...', m, q, m) \
+            + np.sum(q[1:, 1:]*cov[..., perm[:, None], perm], axis=(-2, -1))
+
+    def _batched(self, operation, par):
+        """Whether the parameters of an operation or observable hold one value per batch element.
+
+        Args:
+            operation (str): name of the operation or observable
+            par (Sequence): parameter values
+
+        Returns:
+            bool: True if any parameter of a non-array operation is an array
+        """
+        return operation not in self._array_operations and any(np.ndim(p) > 0 for p in par)
+
     def pre_apply(self):
         self.reset()
 
     def apply(self, operation, wires, par):
+        # the state changes, invalidating the Fock intermediates
+        self._fock_cache.clear()
+
+        batched = self._batched(operation, par)
+        if batched:
+            # one parameter set per batch element
+            self._broadcast_state(np.broadcast(*par).shape[0])
+
         if operation == 'Displacement':
-            self._state = displacement(self._state, wires[0], par[0]*np.exp(1j*par[1]))
+            if not batched and self.fusion:
+                alpha = par[0]*np.exp(1j*par[1])
+                d = np.array([alpha.real, alpha.imag])*np.sqrt(2*self.hbar)
+                self._fuse(np.identity(2), wires, d)
+                return
+
+            self._state = displacement(self._state, wires[0], par[0]*np.exp(1j*par[1]), hbar=self.hbar)
             return # we are done here
 
         if operation == 'GaussianState':
             if wires != list(range(self.num_wires)):
                 raise ValueError("GaussianState means vector or covariance matrix is "
                                  "the incorrect size for the number of subsystems.")
-            self._state = self._operation_map[operation](*par, hbar=self.hbar)
+            mu, cov = self._operation_map[operation](*par, hbar=self.hbar)
+            # gates update the state in place, so copy the user-supplied arrays
+            self._state = [np.array(mu, dtype=np.float64), np.array(cov, dtype=np.float64)]
             return # we are done here
 
         if operation == 'Interferometer':
             if par[0].shape[0] != len(wires):
                 raise ValueError("Interferomer unitary matrix applied to the incorrect "
                                  "number of subsystems.")
-            if len(wires) > 2:
-                raise ValueError("Only 2-mode interferometers are currently supported.")
 
         if 'State' in operation:
             # set the new device state
-            mu, cov = self._operation_map[operation](*par, hbar=self.hbar)
+            if batched:
+                mu, cov = _stack_batch(self._operation_map[operation], par, hbar=self.hbar)
+            else:
+                mu, cov = self._operation_map[operation](*par, hbar=self.hbar)
             # state preparations only act on at most 1 subsystem
             self._state = set_state(self._state, wires[0], mu, cov)
             return # we are done here
 
         # get the symplectic matrix
-        S = self._operation_map[operation](*par)
+        if batched:
+            S = _stack_batch(self._operation_map[operation], par)
+        else:
+            S = self._operation_map[operation](*par)
+            if len(wires) <= self.fusion:
+                self._fuse(S, wires)
+                return
+
+        self.apply_symplectic(S, wires)
 
-        # expand the symplectic to act on the proper subsystem
-        if len(wires) == 1:
-            S = self.expand_one(S, wires[0])
-        elif len(wires) == 2:
-            S = self.expand_two(S, wires)
+    def _fuse(self, S, wires, d=None):
+        r"""Multiply an affine map into the block of fused gates.
+
+        If the block would act on more than :attr:`fusion` modes, the pending block
+        is applied to the state first, and a new block is started.
+
+        Args:
+            S (array): :math:`2k\times 2k` symplectic matrix, in the
+                :math:`(\x_1,\dots,\x_k,\p_1,\dots,\p_k)` ordering
+            wires (Sequence[int]): the :math:`k` wires the map acts on
+            d (array): length-:math:`2k` displacement applied after S, if any
+        """
+        if self._fused is not None and len(set(self._fused[0]) | set(wires)) > self.fusion:
+            self._flush()
+
+        if self._fused is None:
+            self._fused = (list(wires), S.copy(), np.zeros(2*len(wires)) if d is None else d)
+            return
+
+        block, F, e = self._fused
+        new = [w for w in wires if w not in block]
+        if new:
+            # extend the block by the identity on the new modes
+            k = len(block)
+            block = block + new
+            n = len(block)
+            ind = np.r_[0:k, n:n+k]
+            F, F_old = np.identity(2*n), F
+            F[np.ix_(ind, ind)] = F_old
+            e, e_old = np.zeros(2*n), e
+            e[ind] = e_old
+
+        pos = np.array([block.index(w) for w in wires])
+        ind = np.concatenate([pos, pos+len(block)])
+
+        # x -> S (F x + e) + d on the modes of the gate
+        F[ind, :] = S @ F[ind, :]
+        e[ind] = S @ e[ind]
+        if d is not None:
+            e[ind] += d
+
+        self._fused = (block, F, e)
+
+    def _flush(self):
+        """Apply the pending block of fused gates, if any, to the state."""
+        if self._fused is not None:
+            wires, S, d = self._fused
+            self._fused = None
+            self.apply_symplectic(S, wires)
+
+            w = np.array(wires)
+            self._gaussian[0][..., np.concatenate([w, w+self.num_wires])] += d
+
+    @property
+    def _state(self):
+        """list[array]: the vector of means and the covariance matrix,
+        after applying any pending fused gates"""
+        self._flush()
+        return self._gaussian
 
-        # apply symplectic matrix to the means vector
-        means = S @ self._state[0]
-        # apply symplectic matrix to the covariance matrix
-        cov = S @ self._state[1] @ S.T
+    @_state.setter
+    def _state(self, state):
+        self._fused = None
+        self._gaussian = state
+
+    @property
+    def batch_size(self):
+        """int or None: number of parameter sets the state is simulated for,
+        or None if the state is not batched"""
+        mu = self._gaussian[0]
+        return len(mu) if mu.ndim == 2 else None
+
+    def _broadcast_state(self, batch_size):
+        """Broadcast the state to the given batch size.
+
+        Args:
+            batch_size (int): number of parameter sets
+        """
+        if self.batch_size is None:
+            mu, cov = self._state
+            self._state = [np.repeat(mu[np.newaxis], batch_size, axis=0),
+                           np.repeat(cov[np.newaxis], batch_size, axis=0)]
+        elif self.batch_size != batch_size:
+            raise ValueError("Operation parameters have batch size {}, but the state has "
+                             "batch size {}.".format(batch_size, self.batch_size))
+
+    def apply_symplectic(self, S, wires):
+        r"""Applies a symplectic matrix acting on a subset of the modes.
+
+        Only the entries of the means vector, and the rows and columns of the covariance
+        matrix, corresponding to the given modes are updated, which takes :math:`O(N)`
+        operations instead of the :math:`O(N^3)` of a product with the expanded
+        :math:`2N\times 2N` matrix.
+
+        For batched states, S may also be a stack of symplectic matrices, one per
+        batch element.
+
+        Args:
+            S (array): :math:`2k\times 2k` symplectic matrix, in the
+                :math:`(\x_1,\dots,\x_k,\p_1,\dots,\p_k)` ordering
+            wires (Sequence[int]): the :math:`k` wires S acts on
+        """
+        w = np.array(wires)
+        ind = np.concatenate([w, w+self.num_wires])
+        mu, cov = self._state
 
-        self._state = [means, cov]
+        mu[..., ind] = np.einsum('...ij,...j->...i', S, mu[..., ind])
+        cov[..., ind, :] = np.einsum('...ij,...jk->...ik', S, cov[..., ind, :])
+        cov[..., :, ind] = np.einsum('...ij,...kj->...ik', cov[..., :, ind], S)
 
     def expand_one(self, S, wire):
         r"""Expands a one-mode Symplectic matrix S to act on the entire subsystem.
@@ -834,16 +1292,68 @@ class DefaultGaussian(Device):
 
         return S2
 
-    def expval(self, expectation, wires, par):
-        mu, cov = self.reduced_state(wires)
+    def pre_expval(self):
+        self.samples = None
+        if self.shots > 0 and any(e.name in self._quadratures for e in self._expval_queue or []):
+            self.samples = self.quadrature_samples(self.shots)
+
+    def quadrature_samples(self, shots, heterodyne=False):
+        r"""Draws joint samples of the quadratures of all modes from the current state.
+
+        The covariance matrix is factorized once, and all samples are drawn from
+        the resulting multivariate normal distribution.
+
+        Args:
+            shots (int): the number of samples
+            heterodyne (bool): if True, sample heterodyne outcomes instead, whose
+                covariance matrix includes an additional vacuum contribution
+                :math:`\hbar I/2`
 
-        ev, var = self._expectation_map[expectation](mu, cov, wires, par, hbar=self.hbar)
+        Returns:
+            array: array of shape ``(shots, 2N)``, whose columns are ordered as
+            :math:`(\x_1,\dots,\x_N,\p_1,\dots,\p_N)`; for batched states,
+            the batch is the leading dimension
+        """
+        mu, cov = self._state
+        if heterodyne:
+            cov = cov + np.identity(mu.shape[-1])*self.hbar/2
+
+        try:
+            L = np.linalg.cholesky(cov)
+        except np.linalg.LinAlgError:
+            # singular covariance matrix
+            w, V = np.linalg.eigh(cov)
+            L = V*np.sqrt(np.maximum(w, 0))[..., np.newaxis, :]
+
+        z = self._rng.standard_normal(mu.shape[:-1] + (shots, mu.shape[-1]))
+        return mu[..., np.newaxis, :] + z @ np.swapaxes(L, -1, -2)
+
+    def expval(self, expectation, wires, par):
+        if self.shots != 0 and self.samples is not None and expectation in self._quadratures:
+            # estimate the ev from the joint samples of the quadratures
+            phi = self._quadratures[expectation]
+            phi = par[0] if phi is None else phi
+            w = wires[0]
+            return np.mean(np.cos(phi)*self.samples[..., w] + np.sin(phi)*self.samples[..., w+self.num_wires],
+                           axis=-1)
+
+        if self.batch_size is not None:
+            # evaluate the expectation for each batch element
+            fn = self._expectation_map[expectation]
+            mu, cov = self.reduced_state(wires)
+            ev, var = np.array([fn(m, c, wires, par, hbar=self.hbar) for m, c in zip(mu, cov)]).T
+        elif expectation == 'NumberState':
+            ev = _fock_prob(*self._fock_intermediates(wires), par[0])
+            var = ev - ev**2
+        else:
+            mu, cov = self.reduced_state(wires)
+            ev, var = self._expectation_map[expectation](mu, cov, wires, par, hbar=self.hbar)
 
         if self.shots != 0:
             # estimate the ev
             # use central limit theorem, sample normal distribution once, only ok if n_eval is large
             # (see https://en.wikipedia.org/wiki/Berry%E2%80%93Esseen_theorem)
-            ev = np.random.normal(ev, np.sqrt(var / self.shots))
+            ev = self._rng.normal(ev, np.sqrt(var / self.shots))
 
         return ev
 
@@ -851,6 +1361,10 @@ class DefaultGaussian(Device):
         """Reset the device"""
         # init the state vector to |00..0>
         self._state = vacuum_state(self.num_wires, self.hbar)
+        #: dict[tuple[int], tuple]: Fock intermediates of the current state, keyed by wires
+        self._fock_cache = {}
+        #: array: joint quadrature samples drawn for the last execution, see :meth:`quadrature_samples`
+        self.samples = None
 
     def reduced_state(self, wires):
         r""" Returns the vector of means and the covariance matrix of the specified wires.
@@ -878,7 +1392,39 @@ class DefaultGaussian(Device):
         rows = ind.reshape(-1, 1)
         cols = ind.reshape(1, -1)
 
-        return self._state[0][ind], self._state[1][rows, cols]
+        return self._state[0][..., ind], self._state[1][..., rows, cols]
+
+    def fock_probabilities(self, wires, cutoff):
+        """Returns the photon-number distribution of the specified wires.
+
+        Args:
+            wires (int or Sequence[int]): indices of the requested wires
+            cutoff (int): the number of Fock states to include per wire
+
+        Returns:
+            array: array of shape ``[cutoff]*len(wires)`` containing the
+            probabilities of each photon-number event; for batched states,
+            the batch is the leading dimension
+        """
+        if self.batch_size is not None:
+            mu, cov = self.reduced_state(wires)
+            return np.array([fock_probabilities(m, c, cutoff, hbar=self.hbar) for m, c in zip(mu, cov)])
+
+        return _fock_probabilities(*self._fock_intermediates(wires), cutoff)
+
+    def _fock_intermediates(self, wires):
+        """Returns the output of :func:`_hamilton` for the reduced state of the specified wires.
+
+        The :math:`O(N^3)` preprocessing is cached until the state changes, so that
+        all Fock probabilities of the same wires share it.
+        """
+        key = (wires,) if isinstance(wires, int) else tuple(wires)
+
+        if key not in self._fock_cache:
+            mu, cov = self.reduced_state(list(key))
+            self._fock_cache[key] = _hamilton(mu, cov, self.hbar)
+
+        return self._fock_cache[key]
 
     @property
     def operations(self):
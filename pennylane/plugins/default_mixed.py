@@ -0,0 +1,328 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+r"""
+Default mixed plugin
+====================
+
+**Module name:** :mod:`pennylane.plugins.default_mixed`
+
+**Short name:** ``"default.mixed"``
+
+.. currentmodule:: pennylane.plugins.default_mixed
+
+The default mixed plugin provides a simple mixed state simulation of a qubit-based
+quantum circuit architecture, supporting noisy :mod:`channels <pennylane.ops.channel>`
+in addition to the built-in :mod:`qubit operations <pennylane.ops.qubit>` and
+:mod:`expectations <pennylane.expval.qubit>`.
+
+The density matrix of :math:`n` qubits is stored as a tensor with :math:`2n` axes
+of dimension 2, the first :math:`n` axes corresponding to the row indices and the
+last :math:`n` to the column indices. Unitary gates and channels are applied in the
+Kraus representation :math:`\rho\mapsto\sum_k K_k\rho K_k^\dagger`, by contracting the
+Kraus operators with the axes of the wires they act on only.
+
+The following is the technical documentation of the implementation of the plugin. You will
+not need to read and understand this to use this plugin.
+
+Channels
+--------
+
+.. autosummary::
+    amplitude_damping
+    phase_damping
+    depolarizing
+
+Classes
+-------
+
+.. autosummary::
+    DefaultMixed
+
+Code details
+^^^^^^^^^^^^
+"""
+import logging as log
+
+import numpy as np
+
+from .default_qubit import (spectral_decomposition_qubit, amplitudes, cost_diagonal, pauli_rot,
+                           tolerance, I, X, Y, Z, QubitSimulator, DefaultQubit)
+
+
+#========================================================
+#  channels
+#========================================================
+
+def _probability(p):
+    """Input validation for a probability parameter.
+
+    Args:
+        p (float): probability
+
+    Returns:
+        float: probability
+    """
+    if not 0 <= p <= 1:
+        raise ValueError("Channel parameter must be a probability in [0, 1].")
+    return p
+
+
+def amplitude_damping(gamma):
+    r"""Kraus operators of the amplitude damping channel.
+
+    Args:
+        gamma (float): damping probability
+
+    Returns:
+        array: :math:`2\times 2\times 2` array of Kraus operators
+    """
+    gamma = _probability(gamma)
+    K0 = np.array([[1, 0], [0, np.sqrt(1-gamma)]])
+    K1 = np.array([[0, np.sqrt(gamma)], [0, 0]])
+    return np.array([K0, K1])
+
+
+def phase_damping(gamma):
+    r"""Kraus operators of the phase damping channel.
+
+    Args:
+        gamma (float): dephasing probability
+
+    Returns:
+        array: :math:`2\times 2\times 2` array of Kraus operators
+    """
+    gamma = _probability(gamma)
+    K0 = np.array([[1, 0], [0, np.sqrt(1-gamma)]])
+    K1 = np.array([[0, 0], [0, np.sqrt(gamma)]])
+    return np.array([K0, K1])
+
+
+def depolarizing(p):
+    r"""Kraus operators of the depolarizing channel.
+
+    Args:
+        p (float): error probability
+
+    Returns:
+        array: :math:`4\times 2\times 2` array of Kraus operators
+    """
+    p = _probability(p)
+    return np.array([np.sqrt(1-p)*I] + [np.sqrt(p/3)*P for P in (X, Y, Z)])
+
+
+#========================================================
+#  device
+#========================================================
+
+
+class DefaultMixed(QubitSimulator):
+    """Default mixed state qubit device for PennyLane.
+
+    Args:
+        wires (int): the number of modes to initialize the device in
+        shots (int): How many times the circuit should be evaluated (or sampled) to estimate
+            the expectation values. A value of 0 yields the exact result.
+        seed (None, int, array[int], SeedSequence): seed of the random number generator used
+            for sampling. By default, fresh entropy is drawn from the operating system.
+        validate (bool): If False, the matrices of :class:`~.QubitUnitary` operations and
+            :class:`~.expval.Hermitian` expectations are trusted to be unitary and Hermitian,
+            respectively, and are not validated.
+    """
+    name = 'Default mixed PennyLane plugin'
+    short_name = 'default.mixed'
+    pennylane_requires = '0.2.0'
+    version = '0.2.0'
+    author = 'Xanadu Inc.'
+
+    # Unitary operations are the single Kraus operator of the channel
+    # they represent, channels return a stack of Kraus operators.
+    _operation_map = {
+        **DefaultQubit._operation_map,
+        'AmplitudeDamping': amplitude_damping,
+        'PhaseDamping': phase_damping,
+        'DepolarizingChannel': depolarizing
+    }
+
+    _expectation_map = DefaultQubit._expectation_map
+
+    _copies = 2
+
+    def _zero_state(self, n):
+        state = np.zeros([2]*2*n, dtype=complex)
+        state[(0,)*2*n] = 1
+        return state
+
+    def _product(self, states):
+        rho = np.ones([1, 1], dtype=complex)
+        for part in states:
+            m = part.ndim // 2
+            rho = np.kron(rho, part.reshape(2**m, 2**m))
+        return rho.reshape([2]*sum(part.ndim for part in states))
+
+    def apply(self, operation, wires, par):
+        if self._state is None:
+            self._allocate(range(self.num_wires))
+
+        n = self.num_wires
+
+        if operation == 'AmplitudeEmbedding':
+            self._embed(amplitudes(par[0], len(wires)), wires)
+            return
+        elif operation == 'DiagonalCost':
+            D = cost_diagonal(par[1], par[2])
+            if D.shape[0] != 2**len(wires):
+                raise ValueError("DiagonalCost requires one column of terms per wire.")
+            self.apply_diagonal(np.exp(-1j*par[0]*D), wires)
+            return
+        elif operation == 'PauliRot':
+            self.apply_channel(pauli_rot(par[0], self._pauli_word())[np.newaxis], wires)
+            return
+        elif operation == 'QubitStateVector':
+            state = np.asarray(par[0], dtype=np.complex128)
+            if state.ndim == 1 and state.shape[0] == 2**n:
+                self._state = np.outer(state, state.conj()).reshape([2]*2*n)
+            else:
+                raise ValueError('State vector must be of length 2**wires.')
+            return
+        elif operation == 'BasisState':
+            # length of basis state parameter
+            n_basis_state = len(par[0])
+
+            if not set(par[0]).issubset({0, 1}):
+                raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(n))
+            if n_basis_state != len(wires) or n_basis_state != n:
+                raise ValueError("The default.mixed plugin can apply BasisState only to all of the {} wires.".format(n))
+
+            self._state = np.zeros([2]*2*n, dtype=complex)
+            self._state[tuple(par[0])*2] = 1
+            return
+
+        K = np.asarray(self._get_operator_matrix(operation, par))
+        if K.ndim == 2:
+            K = K[np.newaxis]
+
+        self.apply_channel(K, wires)
+
+    def apply_channel(self, kraus, wires):
+        r"""Apply a channel to the density matrix.
+
+        The Kraus operators are contracted with the row and column axes
+        of the target wires only, so that no operator on the full system
+        is ever constructed.
+
+        Args:
+          kraus (array): :math:`k\times 2^m\times 2^m` array of Kraus operators
+          wires (Sequence[int]): the :math:`m` target subsystems
+        """
+        n = len(self._wire_map)
+        m = len(wires)
+        if len(set(wires)) != m:
+            raise ValueError('The wires must be distinct.')
+        wires = self._axes(wires)
+        if kraus.shape[1:] != (2**m, 2**m):
+            raise ValueError('Kraus operators acting on {} wires must be {}x{} matrices.'.format(m, 2**m, 2**m))
+
+        K = kraus.reshape([kraus.shape[0]] + [2]*2*m)
+
+        # einsum subscripts: rows 0..n-1, columns n..2n-1, the Kraus
+        # index 2n, and the new row/column indices of the target wires
+        rows = list(range(n))
+        cols = list(range(n, 2*n))
+        new_rows = list(range(2*n+1, 2*n+1+m))
+        new_cols = list(range(2*n+1+m, 2*n+1+2*m))
+
+        out = rows + cols
+        for w, r, c in zip(wires, new_rows, new_cols):
+            out[w] = r
+            out[n+w] = c
+
+        self._state = np.einsum(K, [2*n] + new_rows + list(wires),
+                                self._state, rows + cols,
+                                K.conj(), [2*n] + new_cols + [n+w for w in wires],
+                                out, optimize=True)
+
+    def apply_diagonal(self, d, wires):
+        r"""Apply a diagonal unitary as an elementwise product with the density matrix.
+
+        Args:
+          d (array[complex]): diagonal of the unitary, of length :math:`2^m`
+          wires (Sequence[int]): the :math:`m` target subsystems
+        """
+        n = len(self._wire_map)
+        axes = self._axes(wires)
+        d = d.reshape([2]*len(axes))
+        self._state = np.einsum(self._state, list(range(2*n)), d, axes,
+                                d.conj(), [n+w for w in axes], list(range(2*n)))
+
+    def expval(self, expectation, wires, par):
+        if self._state is None:
+            self._allocate(range(self.num_wires))
+
+        # measurement/expectation value tr(rho A)
+        A = self._get_operator_matrix(expectation, par)
+        if self.shots == 0:
+            # exact expectation value
+            ev = self.ev(A, wires)
+        else:
+            # estimate the ev
+            # sample Bernoulli distribution n_eval times / binomial distribution once
+            a, P = spectral_decomposition_qubit(A)
+            p0 = self.ev(P[0], wires)  # probability of measuring a[0]
+            n0 = self._rng.binomial(self.shots, p0)
+            ev = (n0*a[0] +(self.shots-n0)*a[1]) / self.shots
+
+        return ev
+
+    def reduced_density_matrix(self, wires):
+        r"""Reduced density matrix of a set of wires in the current state.
+
+        Args:
+          wires (Sequence[int]): subsystems to keep
+
+        Returns:
+          array: :math:`2^k\times 2^k` density matrix, where :math:`k` is the number of wires,
+          with the first wire in ``wires`` being the most significant qubit
+        """
+        k = len(wires)
+        if len(set(wires)) != k:
+            raise ValueError('The wires must be distinct.')
+
+        self._gather(wires)
+        n = len(self._wire_map)
+        wires = self._axes(wires)
+
+        # the column indices of the traced out wires equal their row indices
+        cols = [n+w if w in wires else w for w in range(n)]
+        out = list(wires) + [n+w for w in wires]
+        return np.einsum(self._state, list(range(n)) + cols, out).reshape(2**k, 2**k)
+
+    def ev(self, A, wires):
+        r"""Evaluates an expectation in the current state.
+
+        Args:
+          A (array): Hermitian matrix corresponding to the expectation
+          wires (Sequence[int]): target subsystems
+
+        Returns:
+          float: expectation value :math:`\expect{A} = \text{Tr}(\rho A)`
+        """
+        rho = self.reduced_density_matrix(wires)
+        if A.shape != rho.shape:
+            raise ValueError('{0}x{0} matrix required.'.format(rho.shape[0]))
+
+        expectation = np.trace(rho @ A)
+
+        if np.abs(expectation.imag) > tolerance:
+            log.warning('Nonvanishing imaginary part % in expectation value.', expectation.imag)
+        return expectation.real
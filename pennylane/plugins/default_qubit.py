@@ -39,6 +39,14 @@ Auxillary functions
     spectral_decomposition_qubit
     unitary
     hermitian
+    amplitudes
+    cost_diagonal
+    pauli_map
+    eigensystem
+    active_wires
+    subsystems
+    pauli_words
+    circuit_key
 
 Gates and operations
 --------------------
@@ -49,6 +57,8 @@ Gates and operations
     Roty
     Rotz
     Rot3
+    pauli_rot
+    time_evolution
     X
     Y
     Z
@@ -69,17 +79,21 @@ Classes
 -------
 
 .. autosummary::
+    QubitSimulator
     DefaultQubit
 
 Code details
 ^^^^^^^^^^^^
 """
 import logging as log
+import hashlib
+from collections import OrderedDict
 
 import numpy as np
 from scipy.linalg import expm, eigh
 
 from pennylane import Device
+from pennylane.utils import BoundedCache
 
 log.getLogger()
 
@@ -120,6 +134,9 @@ Y = np.array([[0, -1j], [1j, 0]]) #: Pauli-Y matrix
 Z = np.array([[1, 0], [0, -1]]) #: Pauli-Z matrix
 
 H = np.array([[1, 1], [1, -1]])/np.sqrt(2) #: Hadamard gate
+
+#: array: rotations of the X, Y and Z eigenbases to the computational basis, used by classical shadows
+SHADOW_ROTATIONS = np.array([H, H @ np.diag([1, -1j]), I])
 # Two qubit gates
 CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]) #: CNOT gate
 SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]]) #: SWAP gate
@@ -189,44 +206,243 @@ def Rot3(a, b, c):
 #  Arbitrary states and operators
 #========================================================
 
-def unitary(*args):
-    r"""Input validation for an arbitary unitary operation.
+def pauli_rot(theta, pauli_word):
+    r"""Rotation generated by a multi-qubit Pauli operator.
 
     Args:
-        args (array): square unitary matrix
+        theta (float): rotation angle
+        pauli_word (str): Pauli operator of each qubit
 
     Returns:
-        array: square unitary matrix
+        array: unitary matrix :math:`e^{-i\theta P/2}`
+    """
+    P = np.ones([1, 1])
+    for p in pauli_word:
+        P = np.kron(P, {'I': I, 'X': X, 'Y': Y, 'Z': Z}[p])
+    return np.cos(theta/2)*np.identity(len(P)) - 1j*np.sin(theta/2)*P
+
+
+def time_evolution(t, H):
+    r"""Evolution under a Hermitian generator.
+
+    Args:
+        t (float): evolution time
+        H (array): Hermitian matrix
+
+    Returns:
+        array: unitary matrix :math:`e^{-iHt}`
     """
-    U = np.asarray(args[0])
+    w, V = eigensystem(H)
+    return (V * np.exp(-1j*w*t)) @ V.conj().T
+
+
+_valid_matrices = BoundedCache(64)
+
+
+def _validated(kind, A, check):
+    """Validate a matrix, unless an identical one has recently passed the same check.
 
-    if U.shape[0] != U.shape[1]:
+    Matrices are identified by a digest of their contents, and the 64 most
+    recently validated ones are remembered.
+
+    Args:
+        kind (str): name of the check
+        A (array): matrix to validate
+        check (callable): raises an exception if the matrix is invalid
+
+    Returns:
+        array: the matrix
+    """
+    if A.dtype == object:
+        check(A)
+        return A
+
+    digest = hashlib.blake2b(np.ascontiguousarray(A).tobytes(), digest_size=16).digest()
+    key = (kind, A.shape, A.dtype.str, digest)
+    def compute():
+        """validate A, caching only successful checks"""
+        check(A)
+        return True
+
+    _valid_matrices.get(key, compute)
+    return A
+
+
+def _check_unitary(U):
+    """Raise an exception if U is not a unitary matrix."""
+    if U.ndim != 2 or U.shape[0] != U.shape[1]:
         raise ValueError("Operator must be a square matrix.")
 
     if not np.allclose(U @ U.conj().T, np.identity(U.shape[0])):
         raise ValueError("Operator must be unitary.")
 
-    return U
+
+def _check_hermitian(A):
+    """Raise an exception if A is not a Hermitian matrix."""
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Expectation must be a square matrix.")
+
+    if not np.allclose(A, A.conj().T):
+        raise ValueError("Expectation must be Hermitian.")
+
+
+def unitary(*args):
+    r"""Input validation for an arbitary unitary operation.
+
+    Recently validated matrices are not validated again.
+
+    Args:
+        args (array): square unitary matrix
+
+    Returns:
+        array: square unitary matrix
+    """
+    return _validated('unitary', np.asarray(args[0]), _check_unitary)
 
 
 def hermitian(*args):
     r"""Input validation for an arbitary Hermitian expectation.
 
+    Recently validated matrices are not validated again.
+
     Args:
         args (array): square hermitian matrix
 
     Returns:
         array: square hermitian matrix
     """
-    A = np.asarray(args[0])
+    return _validated('hermitian', np.asarray(args[0]), _check_hermitian)
 
-    if A.shape[0] != A.shape[1]:
-        raise ValueError("Expectation must be a square matrix.")
 
-    if not np.allclose(A, A.conj().T):
-        raise ValueError("Expectation must be Hermitian.")
+def amplitudes(features, num_wires):
+    r"""Input validation and normalization for an amplitude embedding.
+
+    The features are padded with zeros to length :math:`2^n` and normalized.
+    If they already are a normalized complex vector of the right length,
+    they are returned without being copied. Note that this only applies to
+    direct device calls: a QNode rebuilds the features from its flattened
+    parameters on every evaluation.
+
+    Args:
+        features (array): feature vector of length at most :math:`2^n`
+        num_wires (int): number of wires :math:`n`
+
+    Returns:
+        array[complex]: normalized state vector of length :math:`2^n`
+    """
+    state = np.asarray(features)
+    if state.ndim != 1 or state.shape[0] > 2**num_wires:
+        raise ValueError("AmplitudeEmbedding requires at most 2**len(wires) features.")
+
+    if state.shape[0] < 2**num_wires or state.dtype != np.complex128:
+        temp = np.zeros(2**num_wires, dtype=np.complex128)
+        temp[:state.shape[0]] = state
+        state = temp
+
+    norm = np.linalg.norm(state)
+    if norm == 0:
+        raise ValueError("AmplitudeEmbedding requires a nonzero feature vector.")
+    if np.abs(norm - 1) > tolerance:
+        state = state / norm
+
+    return state
+
+
+_cost_diagonals = BoundedCache(16)
+
+
+def cost_diagonal(coeffs, terms):
+    r"""Diagonal of a cost Hamiltonian made of Pauli-Z terms.
+
+    Args:
+        coeffs (array[float]): coefficients :math:`c_k` of the terms
+        terms (array[int]): array of 0 or 1 integers of shape ``(len(coeffs), n)``,
+            marking the wires of each term
+
+    Returns:
+        array[float]: read-only diagonal of :math:`C = \sum_k c_k \prod_{j\in T_k} Z_j`,
+        of length :math:`2^n`
+    """
+    coeffs = np.asarray(coeffs, dtype=np.float64)
+    terms = np.asarray(terms, dtype=np.int64)
+    if terms.ndim != 2 or coeffs.shape != terms.shape[:1]:
+        raise ValueError("DiagonalCost requires one coefficient per row of terms.")
+
+    def compute():
+        """diagonal of the cost Hamiltonian"""
+        n = terms.shape[1]
+        # bits of the computational basis states, most significant first
+        bits = (np.arange(2**n)[:, None] >> np.arange(n-1, -1, -1)) & 1
+        parity = (bits @ terms.T) % 2
+        return (1-2*parity) @ coeffs
+
+    return _cost_diagonals.get((coeffs.tobytes(), terms.tobytes(), terms.shape), compute)
+
+
+_pauli_maps = BoundedCache(16)
+
+
+def pauli_map(pauli_word, axes, num_wires):
+    r"""Index map and phases of a multi-qubit Pauli operator acting on a state vector.
+
+    The Pauli operator :math:`P` maps the basis state :math:`\ket{b}` to
+    :math:`i^{n_Y}(-1)^{|b\wedge m_{YZ}|}\ket{b\oplus m_{XY}}`, where :math:`m_{XY}` and
+    :math:`m_{YZ}` mark the subsystems acted on by :math:`X, Y` and :math:`Y, Z` respectively.
+    Hence ``(P @ state) == phase * state[idx]``.
+
+    Args:
+        pauli_word (str): Pauli operator of each subsystem in ``axes``
+        axes (Sequence[int]): subsystems of the state acted on
+        num_wires (int): number of subsystems of the state
+
+    Returns:
+        tuple[array[int], array[complex]]: read-only index map ``idx`` and ``phase``
+    """
+    def compute():
+        """index map and phases of the Pauli operator"""
+        flip = 0
+        for p, a in zip(pauli_word, axes):
+            if p in 'XY':
+                flip |= 1 << (num_wires-1-a)
+
+        idx = np.arange(2**num_wires) ^ flip
+        parity = np.zeros(2**num_wires, dtype=np.int64)
+        for p, a in zip(pauli_word, axes):
+            if p in 'YZ':
+                parity ^= (idx >> (num_wires-1-a)) & 1
+
+        phase = 1j**pauli_word.count('Y') * (1-2*parity)
+        return idx, phase
+
+    return _pauli_maps.get((pauli_word, tuple(axes), num_wires), compute)
+
+
+_eigensystems = BoundedCache(16)
+
+
+def eigensystem(H):
+    r"""Eigendecomposition of a Hermitian matrix.
+
+    Evolving under the same generator for different times reuses the
+    eigendecomposition of one of the recently seen matrices.
+
+    Args:
+        H (array): Hermitian matrix
+
+    Returns:
+        tuple[array[float], array[complex]]: read-only eigenvalues :math:`\lambda`, and matrix
+        :math:`V` whose columns are the corresponding eigenvectors
+    """
+    H = np.asarray(H)
+
+    def compute():
+        """eigendecomposition of H"""
+        if H.ndim != 2 or H.shape[0] != H.shape[1] or not np.allclose(H, H.conj().T):
+            raise ValueError("TimeEvolution generator must be a Hermitian matrix.")
+        return tuple(np.linalg.eigh(H))
+
+    return _eigensystems.get((H.tobytes(), H.shape, H.dtype.str), compute)
 
-    return A
 
 def identity(*_):
     """Identity matrix for expectations.
@@ -236,18 +452,353 @@ def identity(*_):
     """
     return np.identity(2)
 
+def active_wires(queue, expectation, num_wires):
+    """Wires acted on by a circuit.
+
+    State preparations, as well as operations and expectations without
+    explicit wires, are assumed to act on all the wires of the device.
+
+    Args:
+        queue (Iterable[~.operation.Operation]): operations of the circuit
+        expectation (Iterable[~.operation.Expectation]): expectations of the circuit
+        num_wires (int): number of wires of the device
+
+    Returns:
+        list[int]: sorted list of the wires used
+    """
+    wires = set()
+    for op in list(queue) + list(expectation):
+        if not op.wires or op.name in ('BasisState', 'QubitStateVector'):
+            return list(range(num_wires))
+        wires.update(op.wires)
+    return sorted(wires)
+
+
+def subsystems(queue, expectation):
+    """Split a circuit into parts acting on disjoint sets of wires.
+
+    The parts are the connected components of the graph whose vertices are
+    the wires, with an edge between any two wires acted on by the same operation
+    or expectation. Parts without expectations are discarded, as they do not
+    affect the result.
+
+    Args:
+        queue (Iterable[~.operation.Operation]): operations of the circuit
+        expectation (Iterable[~.operation.Expectation]): expectations of the circuit
+
+    Returns:
+        list[tuple[list, list, list[int]]]: operations, expectations and the positions
+        of the expectations in ``expectation`` for each part
+    """
+    queue = list(queue)
+    expectation = list(expectation)
+    parent = {}
+
+    def find(w):
+        """Root of the component of wire w."""
+        while parent[w] != w:
+            parent[w] = parent[parent[w]]
+            w = parent[w]
+        return w
+
+    for op in queue + expectation:
+        wires = op.wires
+        if not wires or op.name in ('BasisState', 'QubitStateVector'):
+            # acts on all wires
+            return [(queue, expectation, list(range(len(expectation))))]
+
+        for w in wires:
+            parent.setdefault(w, w)
+        root = find(wires[0])
+        for w in wires[1:]:
+            parent[find(w)] = root
+
+    parts = OrderedDict()
+    for i, ex in enumerate(expectation):
+        part = parts.setdefault(find(ex.wires[0]), ([], [], []))
+        part[1].append(ex)
+        part[2].append(i)
+
+    for op in queue:
+        root = find(op.wires[0])
+        if root in parts:
+            parts[root][0].append(op)
+
+    return list(parts.values())
+
+
+def pauli_words(queue):
+    """Pauli words of the :class:`~.PauliRot` operations of a circuit.
+
+    Devices receive only the numeric parameters of the operations they apply,
+    so the Pauli words are collected from the queue before applying it.
+
+    Args:
+        queue (Iterable[~.operation.Operation]): operations of the circuit
+
+    Returns:
+        list[str]: Pauli words in reverse order of application, ready to be popped
+    """
+    return [op.pauli_word for op in reversed(list(queue)) if op.name == 'PauliRot']
+
+
+def circuit_key(queue):
+    """Hashable key identifying a sequence of unitary operations and their parameters.
+
+    Args:
+        queue (Iterable[~.operation.Operation]): operations
+
+    Returns:
+        tuple or None: the names, wires, parameter values and Pauli words of the operations,
+        or None if the sequence contains state preparations
+    """
+    key = []
+    for op in queue:
+        if op.name in ('BasisState', 'QubitStateVector', 'AmplitudeEmbedding'):
+            return None
+        par = tuple(np.asarray(p).tobytes() for p in op.parameters)
+        key.append((op.name, tuple(op.wires), par, getattr(op, 'pauli_word', None)))
+    return tuple(key)
+
+
 #========================================================
 #  device
 #========================================================
 
 
-class DefaultQubit(Device):
+class QubitSimulator(Device):
+    """Base class of the qubit simulator devices.
+
+    The simulators only allocate the wires a circuit acts on, and simulate the
+    independent parts of a circuit separately. Subclasses choose the representation
+    of the state by defining :attr:`_copies`, :meth:`_zero_state` and :meth:`_product`.
+
+    Args:
+        wires (int): the number of qubits to initialize the device in
+        shots (int): How many times the circuit should be evaluated (or sampled) to estimate
+            the expectation values. A value of 0 yields the exact result.
+        seed (None, int, array[int], SeedSequence): seed of the random number generator used
+            for sampling. By default, fresh entropy is drawn from the operating system.
+        validate (bool): If False, the matrices of :class:`~.QubitUnitary` operations and
+            :class:`~.expval.Hermitian` expectations are trusted to be unitary and Hermitian,
+            respectively, and are not validated.
+    """
+    _copies = 1  #: int: number of tensor indices of the state per wire
+
+    def __init__(self, wires, *, shots=0, seed=None, validate=True):
+        super().__init__(wires, shots, seed=seed)
+        self._state = None
+        self._pauli_words = []
+        self._wire_map = {w: w for w in range(self.num_wires)}
+        self._parts = None
+        self.validate = validate
+
+    def execute(self, queue, expectation):
+        self.check_validity(queue, expectation)
+        return self._execute_parts(queue, expectation)
+
+    def _execute_parts(self, queue, expectation):
+        """Simulate the independent parts of a circuit separately.
+
+        The final state of each part is kept, for the state accessors
+        to combine them on demand.
+
+        Args:
+            queue (Sequence[~.operation.Operation]): operations to execute
+            expectation (Sequence[~.operation.Expectation]): expectations to evaluate
+
+        Returns:
+            array[float]: expectation value(s)
+        """
+        expectations = np.zeros(len(expectation))
+        parts = []
+
+        for ops, exps, idx in subsystems(queue, expectation):
+            expectations[idx] = Device.execute(self, ops, exps)
+            parts.append((self._wire_map, self._state))
+
+        if len(parts) > 1:
+            self._parts = parts
+
+        return expectations
+
+    def pre_apply(self):
+        self.reset()
+        # only allocate the wires the circuit acts on
+        self._allocate(active_wires(self.op_queue, self.expval_queue, self.num_wires))
+        self._pauli_words = pauli_words(self.op_queue)
+
+    def _pauli_word(self):
+        """Pauli word of the :class:`~.PauliRot` operation being applied.
+
+        Returns:
+            str: Pauli operator of each wire
+        """
+        if not self._pauli_words:
+            raise ValueError("PauliRot can only be applied within execute, which provides its Pauli word.")
+        return self._pauli_words.pop()
+
+    def _get_operator_matrix(self, operation, par):
+        """Get the operator matrix for a given operation or expectation.
+
+        Args:
+          operation    (str): name of the operation/expectation
+          par (tuple[float]): parameter values
+        Returns:
+          array: matrix representation.
+        """
+        A = {**self._operation_map, **self._expectation_map}[operation]
+        if not callable(A):
+            return A
+        if not self.validate and A in (unitary, hermitian):
+            # trust user-supplied matrices
+            return np.asarray(par[0])
+        return A(*par)
+
+    def reset(self):
+        """Reset the device"""
+        # the state is allocated once the wires to be simulated are known
+        self._state = None
+        self._wire_map = {w: w for w in range(self.num_wires)}
+        self._parts = None
+
+    def _allocate(self, wires):
+        r"""Initialize the given wires to :math:`\ket{00\dots 0}`.
+
+        Args:
+          wires (Sequence[int]): device wires to simulate, in order
+        """
+        self._wire_map = {w: i for i, w in enumerate(wires)}
+        self._state = self._zero_state(len(self._wire_map))
+
+    def _zero_state(self, n):
+        r"""State :math:`\ket{00\dots 0}` of ``n`` qubits.
+
+        Args:
+          n (int): number of qubits
+
+        Returns:
+          array: state in the representation of the device
+        """
+        raise NotImplementedError
+
+    def _product(self, states):
+        """Product state of independent parts.
+
+        Args:
+          states (Sequence[array]): states of the parts, in the representation of the device
+
+        Returns:
+          array: state of all of the parts, with the qubits in the given order
+        """
+        raise NotImplementedError
+
+    def _gather(self, wires):
+        """Combine the independently simulated parts of the last circuit acting on the given wires.
+
+        When :meth:`execute` splits a circuit into independent parts, the state
+        only holds the last part simulated. The parts acting on the requested
+        wires are combined into their product state, so that the state accessors
+        cover all of the simulated wires.
+
+        Args:
+          wires (Iterable[int]): device wires
+
+        Returns:
+          bool: whether the state was replaced
+        """
+        if self._parts is None or all(w in self._wire_map for w in wires):
+            return False
+
+        wire_map = {}
+        states = []
+        for part_map, part_state in self._parts:
+            if any(w in part_map for w in wires):
+                for w in sorted(part_map, key=part_map.get):
+                    wire_map[w] = len(wire_map)
+                states.append(part_state)
+
+        self._wire_map = wire_map
+        self._state = self._product(states)
+        return True
+
+    def _axes(self, wires):
+        """Positions of the given device wires in the internal state.
+
+        Args:
+          wires (Sequence[int]): device wires
+
+        Returns:
+          list[int]: corresponding subsystems of the state
+        """
+        try:
+            return [self._wire_map[w] for w in wires]
+        except KeyError as e:
+            raise ValueError('Wire {} is not allocated in the current state.'.format(e.args[0]))
+
+    def _embed(self, state, wires):
+        r"""Prepare the given wires in a pure state.
+
+        The wires are assumed to be in the state :math:`\ket{0}`, and unentangled
+        from the rest of the system.
+
+        Args:
+          state (array[complex]): normalized state vector of the wires
+          wires (Sequence[int]): target subsystems
+        """
+        n = len(self._wire_map)
+        c = self._copies
+        axes = self._axes(wires)
+        if c == 1 and axes == list(range(n)):
+            # the state is used as is
+            self._state = state
+            return
+
+        # state of the other wires, with one set of indices per copy
+        others = [k*n+w for k in range(c) for w in range(n) if w not in axes]
+        idx = [slice(None)]*c*n
+        for k in range(c):
+            for w in axes:
+                idx[k*n+w] = 0
+        rest = self._state.reshape([2]*c*n)[tuple(idx)]
+
+        psi = state.reshape([2]*len(axes))
+        operands = [psi, axes]
+        if c == 2:
+            operands += [psi.conj(), [n+w for w in axes]]
+        self._state = np.einsum(*operands, rest, others, list(range(c*n))).reshape(self._state.shape)
+
+    @property
+    def operations(self):
+        return set(self._operation_map.keys())
+
+    @property
+    def expectations(self):
+        return set(self._expectation_map.keys())
+
+
+class DefaultQubit(QubitSimulator):
     """Default qubit device for PennyLane.
 
     Args:
         wires (int): the number of modes to initialize the device in
         shots (int): How many times the circuit should be evaluated (or sampled) to estimate
             the expectation values. A value of 0 yields the exact result.
+        seed (None, int, array[int], SeedSequence): seed of the random number generator used
+            for sampling. By default, fresh entropy is drawn from the operating system.
+        validate (bool): If False, the matrices of :class:`~.QubitUnitary` operations and
+            :class:`~.expval.Hermitian` expectations are trusted to be unitary and Hermitian,
+            respectively, and are not validated.
+        shadows (bool): If True and ``shots > 0``, each execution records a classical shadow:
+            every shot measures each qubit in a random Pauli basis. All expectation values
+            are estimated from this single batch of snapshots, and further Pauli expectations
+            can be obtained from it using :meth:`shadow_expval`.
+        shadow_groups (int): number of groups of snapshots used by the median-of-means
+            estimator of classical shadows
+        cache (bool): If True, circuits starting with a :class:`~.BasisState` preparation
+            cache their output state for each input basis state. As long as the remaining
+            operations and their parameters are unchanged, evaluating the circuit on
+            a recently seen input skips the simulation.
     """
     name = 'Default qubit PennyLane plugin'
     short_name = 'default.qubit'
@@ -255,13 +806,16 @@ class DefaultQubit(Device):
     version = '0.2.0'
     author = 'Xanadu Inc.'
 
-    # Note: BasisState and QubitStateVector don't
-    # map to any particular function, as they modify
+    # Note: BasisState, QubitStateVector, AmplitudeEmbedding, DiagonalCost and PauliRot
+    # don't map to any particular function, as they modify
     # the internal device state directly.
     _operation_map = {
         'BasisState': None,
         'QubitStateVector': None,
+        'AmplitudeEmbedding': None,
         'QubitUnitary': unitary,
+        'DiagonalCost': None,
+        'TimeEvolution': time_evolution,
         'PauliX': X,
         'PauliY': Y,
         'PauliZ': Z,
@@ -273,7 +827,8 @@ class DefaultQubit(Device):
         'RX': Rotx,
         'RY': Roty,
         'RZ': Rotz,
-        'Rot': Rot3
+        'Rot': Rot3,
+        'PauliRot': None
     }
 
     _expectation_map = {
@@ -285,32 +840,134 @@ class DefaultQubit(Device):
         'Identity': identity
     }
 
-    def __init__(self, wires, *, shots=0):
-        super().__init__(wires, shots)
+    _max_cached_amplitudes = 2**22  #: int: total size of the output states kept when ``cache=True``
+
+    def __init__(self, wires, *, shots=0, seed=None, validate=True, shadows=False, shadow_groups=10,
+                 cache=False):
+        super().__init__(wires, shots=shots, seed=seed, validate=validate)
         self.eng = None
-        self._state = None
+        self._layer = None
+        self._probs = None
+        self._rdm = {}
+        self.shadows = shadows
+        self.shadow_groups = shadow_groups
+        self._shadow = None
+        self.cache = cache
+        self._columns = OrderedDict()
+        self._columns_key = None
+
+    def execute(self, queue, expectation):
+        # simulate the independent parts of the circuit separately
+        self.check_validity(queue, expectation)
+
+        if self.cache and queue and queue[0].name == 'BasisState':
+            key = circuit_key(queue[1:])
+            if key is not None:
+                return self._execute_column(queue, expectation, key)
+
+        if self.shadows and self.shots > 0:
+            # a single batch of snapshots serves all of the expectations
+            return Device.execute(self, queue, expectation)
+
+        return self._execute_parts(queue, expectation)
+
+    def _execute_column(self, queue, expectation, key):
+        """Execute a circuit starting with a basis state preparation, using cached output states.
+
+        The output state of the circuit is a column of its unitary, selected by
+        the input basis state. The most recently used columns, up to
+        :attr:`_max_cached_amplitudes` amplitudes in total, are kept until the
+        operations following the preparation, or their parameters, change.
 
-    def pre_apply(self):
+        Args:
+            queue (Sequence[~.operation.Operation]): operations, starting with a :class:`~.BasisState`
+            expectation (Sequence[~.operation.Expectation]): expectations to evaluate
+            key (tuple): :func:`circuit_key` of the operations following the preparation
+
+        Returns:
+            array[float]: expectation value(s)
+        """
+        if key != self._columns_key:
+            # the circuit or its parameters have changed
+            self._columns = OrderedDict()
+            self._columns_key = key
+
+        col = self._basis_index(queue[0].parameters[0], queue[0].wires)
+        if col not in self._columns:
+            res = Device.execute(self, queue, expectation)
+            self._columns[col] = self._state
+            while len(self._columns) > max(1, self._max_cached_amplitudes // self._state.size):
+                self._columns.popitem(last=False)
+            return res
+
+        self._columns.move_to_end(col)
         self.reset()
+        self._state = self._columns[col]
+
+        with self.execution_context():
+            self.pre_expval()
+            expectations = [self.expval(e.name, e.wires, e.parameters) for e in expectation]
+            self.post_expval()
+
+        return np.array(expectations)
+
+    def pre_apply(self):
+        super().pre_apply()
+
+        # during execution, single-qubit gates on distinct wires are
+        # collected into layers and applied in a single pass
+        self._layer = {}
+
+    def post_apply(self):
+        self._flush_layer()
+        self._layer = None
 
     def apply(self, operation, wires, par):
-        if operation == 'QubitStateVector':
-            state = np.asarray(par[0], dtype=np.float64)
+        if self._state is None:
+            self._allocate(range(self.num_wires))
+
+        # the state is about to change
+        self._probs = None
+        self._rdm = {}
+        self._shadow = None
+
+        if operation in ('QubitStateVector', 'BasisState', 'AmplitudeEmbedding',
+                         'DiagonalCost', 'PauliRot', 'TimeEvolution'):
+            self._flush_layer()
+
+        if operation == 'AmplitudeEmbedding':
+            self._embed(amplitudes(par[0], len(wires)), wires)
+            return
+        elif operation == 'DiagonalCost':
+            D = cost_diagonal(par[1], par[2])
+            if D.shape[0] != 2**len(wires):
+                raise ValueError("DiagonalCost requires one column of terms per wire.")
+            self.apply_diagonal(np.exp(-1j*par[0]*D), wires)
+            return
+        elif operation == 'TimeEvolution':
+            # V exp(-i lambda t) V^dagger, with the cached eigendecomposition of H
+            w, V = eigensystem(par[1])
+            self.apply_matrix(V.conj().T, wires)
+            self.apply_diagonal(np.exp(-1j*par[0]*w), wires)
+            self.apply_matrix(V, wires)
+            return
+        elif operation == 'PauliRot':
+            pauli_word = self._pauli_word()
+            if len(pauli_word) != len(wires):
+                raise ValueError("PauliRot requires one Pauli operator per wire.")
+            # matrix-free: exp(-i theta P/2) psi = cos(theta/2) psi - i sin(theta/2) P psi
+            idx, phase = pauli_map(pauli_word, self._axes(wires), len(self._wire_map))
+            self._state = np.cos(par[0]/2)*self._state - 1j*np.sin(par[0]/2)*phase*self._state[idx]
+            return
+        elif operation == 'QubitStateVector':
+            state = np.asarray(par[0], dtype=np.complex128)
             if state.ndim == 1 and state.shape[0] == 2**self.num_wires:
                 self._state = state
             else:
                 raise ValueError('State vector must be of length 2**wires.')
             return
         elif operation == 'BasisState':
-            n = len(par[0])
-            # get computational basis state number
-            if n > self.num_wires or not (set(par[0]) == {0, 1} or set(par[0]) == {0} or set(par[0]) == {1}):
-                raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(self.num_wires))
-            if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
-                raise ValueError("The default.qubit plugin can apply BasisState only to all of the {} wires.".format(self.num_wires))
-
-            num = int(np.sum(np.array(par[0])*2**np.arange(n-1, -1, -1)))
-
+            num = self._basis_index(par[0], wires)
             self._state = np.zeros_like(self._state)
             self._state[num] = 1.
             return
@@ -319,43 +976,322 @@ class DefaultQubit(Device):
 
         # apply unitary operations
         if len(wires) == 1:
-            U = self.expand_one(A, wires)
-        elif len(wires) == 2:
+            if self._layer is None:
+                self.apply_layer([A], wires)
+                return
+
+            if wires[0] in self._layer:
+                # the wire is already occupied in the current layer
+                self._flush_layer()
+            self._layer[wires[0]] = A
+            return
+
+        self._flush_layer()
+
+        if len(wires) == 2:
             U = self.expand_two(A, wires)
         else:
             raise ValueError('This plugin supports only one- and two-qubit gates.')
 
         self._state = U @ self._state
 
+    def _basis_index(self, bits, wires):
+        """Index of a computational basis state in the state vector.
+
+        Args:
+          bits (array[int]): basis state, as an array of 0 or 1 integers
+          wires (Sequence[int]): target subsystems, which must be all of the wires
+
+        Returns:
+          int: index of the basis state
+        """
+        n = len(bits)
+        if n > self.num_wires or not (set(bits) == {0, 1} or set(bits) == {0} or set(bits) == {1}):
+            raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(self.num_wires))
+        if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
+            raise ValueError("The default.qubit plugin can apply BasisState only to all of the {} wires.".format(self.num_wires))
+
+        # get computational basis state number
+        return int(np.sum(np.array(bits)*2**np.arange(n-1, -1, -1)))
+
+    def apply_matrix(self, U, wires):
+        r"""Apply an operator to a subset of the wires.
+
+        The operator is contracted with the corresponding axes of the state
+        tensor, rather than expanded into a :math:`2^n\times 2^n` matrix.
+
+        Args:
+          U (array): :math:`2^k\times 2^k` matrix
+          wires (Sequence[int]): the :math:`k` target subsystems
+        """
+        if len(set(wires)) != len(wires):
+            raise ValueError('The wires must be distinct.')
+
+        n = len(self._wire_map)
+        axes = self._axes(wires)
+        k = len(axes)
+        if U.shape != (2**k, 2**k):
+            raise ValueError('{0}x{0} matrix required.'.format(2**k))
+
+        # the new indices n..n+k-1 replace the contracted indices of the wires
+        new = list(range(n, n+k))
+        out = list(range(n))
+        for w, i in zip(axes, new):
+            out[w] = i
+
+        self._state = np.einsum(U.reshape([2]*2*k), new + axes,
+                                self._state.reshape([2]*n), list(range(n)), out).reshape(-1)
+
+    def apply_diagonal(self, d, wires):
+        r"""Apply a diagonal operator as an elementwise product with the state.
+
+        Args:
+          d (array[complex]): diagonal of the operator, of length :math:`2^k`
+          wires (Sequence[int]): the :math:`k` target subsystems
+        """
+        n = len(self._wire_map)
+        axes = self._axes(wires)
+        if axes == list(range(n)):
+            self._state = self._state * d
+            return
+
+        self._state = np.einsum(self._state.reshape([2]*n), list(range(n)),
+                                d.reshape([2]*len(axes)), axes, list(range(n))).reshape(-1)
+
+    def apply_layer(self, mats, wires):
+        r"""Apply a layer of one-qubit operators acting on distinct wires.
+
+        All operators are contracted with the corresponding axes of the
+        state tensor in a single einsum call, rather than expanding each
+        of them into a :math:`2^n\times 2^n` matrix.
+
+        Args:
+          mats (Sequence[array]): :math:`2\times 2` matrices
+          wires (Sequence[int]): target subsystem of each matrix
+        """
+        if len(set(wires)) != len(wires):
+            raise ValueError('The wires of a layer must be distinct.')
+
+        n = len(self._wire_map)
+        operands = [self._state.reshape([2]*n), list(range(n))]
+        out = list(range(n))
+
+        for k, (U, w) in enumerate(zip(mats, self._axes(wires))):
+            if U.shape != (2, 2):
+                raise ValueError('2x2 matrix required.')
+            # the new index n+k of wire w replaces the contracted index w
+            operands += [U, [n+k, w]]
+            out[w] = n+k
+
+        self._state = np.einsum(*operands, out, optimize=len(mats) > 1).reshape(-1)
+
+    def _flush_layer(self):
+        """Apply the pending layer of one-qubit gates, if any."""
+        if self._layer:
+            wires = list(self._layer)
+            self.apply_layer([self._layer[w] for w in wires], wires)
+            self._layer = {}
+
+    def pre_expval(self):
+        self._probs = None
+        self._rdm = {}
+        if self.shadows and self.shots > 0:
+            if self._state is None:
+                self._allocate(range(self.num_wires))
+            self._shadow = self.classical_shadow(self.shots)
+
+    def post_expval(self):
+        self._probs = None
+        self._rdm = {}
+
     def expval(self, expectation, wires, par):
+        if self._state is None:
+            self._allocate(range(self.num_wires))
+
         # measurement/expectation value <psi|A|psi>
         A = self._get_operator_matrix(expectation, par)
         if self.shots == 0:
             # exact expectation value
-            ev = self.ev(A, wires)
+            ev = self._local_ev(A, wires)
+        elif self._shadow is not None:
+            # estimate the ev from the Pauli decomposition of A
+            if A.shape != (2, 2):
+                raise ValueError('2x2 matrix required.')
+            ev = np.trace(A).real/2
+            for P, name in zip((X, Y, Z), 'XYZ'):
+                c = np.trace(P @ A).real/2
+                if c != 0:
+                    ev += c*self.shadow_expval(name, wires)
         else:
             # estimate the ev
             # sample Bernoulli distribution n_eval times / binomial distribution once
             a, P = spectral_decomposition_qubit(A)
-            p0 = self.ev(P[0], wires)  # probability of measuring a[0]
-            n0 = np.random.binomial(self.shots, p0)
+            p0 = self._local_ev(P[0], wires)  # probability of measuring a[0]
+            n0 = self._rng.binomial(self.shots, p0)
             ev = (n0*a[0] +(self.shots-n0)*a[1]) / self.shots
 
         return ev
 
-    def _get_operator_matrix(self, operation, par):
-        """Get the operator matrix for a given operation or expectation.
+    def classical_shadow(self, shots):
+        r"""Sample a classical shadow of the current state.
+
+        In each snapshot, every qubit is measured in the eigenbasis of a uniformly
+        random Pauli operator. Snapshots sharing the same measurement bases are
+        sampled together.
 
         Args:
-          operation    (str): name of the operation/expectation
-          par (tuple[float]): parameter values
+          shots (int): number of snapshots
+
         Returns:
-          array: matrix representation.
+          tuple[array[uint8], array[uint8]]: ``bases`` of the measurements
+          (0, 1 and 2 denoting :math:`X`, :math:`Y` and :math:`Z`) and measured ``bits``,
+          both of shape ``(shots, n)``, where column :math:`i` corresponds to
+          the :math:`i`-th simulated wire
         """
-        A = {**self._operation_map, **self._expectation_map}[operation]
-        if not callable(A):
-            return A
-        return A(*par)
+        n = len(self._wire_map)
+        bases = self._rng.integers(0, 3, size=(shots, n), dtype=np.uint8)
+        bits = np.empty_like(bases)
+
+        settings, inverse = np.unique(bases, axis=0, return_inverse=True)
+        psi = self._state.reshape([2]*n)
+        for k, setting in enumerate(settings):
+            idx = np.flatnonzero(inverse.ravel() == k)
+
+            # rotate the measurement bases to the computational basis
+            operands = [psi, list(range(n))]
+            for w, b in enumerate(setting):
+                operands += [SHADOW_ROTATIONS[b], [n+w, w]]
+            probs = np.abs(np.einsum(*operands, list(range(n, 2*n))).ravel())**2
+
+            outcomes = self._rng.choice(2**n, size=len(idx), p=probs/probs.sum())
+            bits[idx] = (outcomes[:, np.newaxis] >> np.arange(n-1, -1, -1)) & 1
+
+        return bases, bits
+
+    def shadow_expval(self, pauli_word, wires):
+        r"""Estimate the expectation value of a Pauli operator from the recorded classical shadow.
+
+        Each snapshot yields the unbiased estimate :math:`\prod_j 3\,\delta_{b_j, P_j}(-1)^{m_j}`,
+        where :math:`b_j` and :math:`m_j` are the basis and outcome of the measurement of wire :math:`j`.
+        The estimates are combined using the median of means over
+        :attr:`shadow_groups` groups of snapshots.
+
+        Args:
+          pauli_word (str): ``'I'``, ``'X'``, ``'Y'`` or ``'Z'`` for each wire
+          wires (Sequence[int]): wires the Pauli operator acts on
+
+        Returns:
+          float: estimated expectation value
+        """
+        if self._shadow is None:
+            raise ValueError('No classical shadow has been recorded.')
+
+        bases, bits = self._shadow
+        est = np.ones(bases.shape[0])
+        for p, w in zip(pauli_word, self._axes(wires)):
+            if p != 'I':
+                est *= 3*(bases[:, w] == 'XYZ'.index(p))*(1-2*bits[:, w].astype(np.int64))
+
+        groups = np.array_split(est, min(self.shadow_groups, len(est)))
+        return np.median([g.mean() for g in groups])
+
+    def _local_ev(self, A, wires):
+        """Expectation value of a local operator in the current state.
+
+        Diagonal operators are evaluated from the marginal probability
+        distribution of their wires, all others using the reduced density
+        matrix of their wires.
+
+        Args:
+          A (array): Hermitian matrix corresponding to the expectation
+          wires (Sequence[int]): target subsystems
+
+        Returns:
+          float: expectation value
+        """
+        if A.shape != (2**len(wires),)*2:
+            raise ValueError('{0}x{0} matrix required.'.format(2**len(wires)))
+
+        if np.count_nonzero(A - np.diag(np.diagonal(A))) == 0:
+            return self.marginal_prob(wires) @ np.diagonal(A).real
+
+        rho = self.reduced_density_matrix(wires)
+        expectation = np.trace(rho @ A)
+        if np.abs(expectation.imag) > tolerance:
+            log.warning('Nonvanishing imaginary part % in expectation value.', expectation.imag)
+        return expectation.real
+
+    def marginal_prob(self, wires):
+        r"""Marginal probability distribution of the computational basis states of a set of wires.
+
+        The probabilities :math:`|\braket{i|\psi}|^2` of the full state are computed
+        only once per state and cached; the marginal is then obtained by summing
+        over the axes of the probability tensor corresponding to the remaining wires.
+
+        Args:
+          wires (Sequence[int]): subsystems to keep
+
+        Returns:
+          array[float]: probabilities of the :math:`2^{len(wires)}` basis states, with
+          the first wire in ``wires`` being the most significant bit
+        """
+        wires = list(wires)
+        if len(set(wires)) != len(wires):
+            raise ValueError('The wires must be distinct.')
+
+        self._gather(wires)
+        n = len(self._wire_map)
+        wires = self._axes(wires)
+
+        if self._probs is None:
+            state = np.asarray(self._state)
+            self._probs = (state.real**2 + state.imag**2).reshape([2]*n)
+
+        other = tuple(w for w in range(n) if w not in wires)
+        prob = np.sum(self._probs, axis=other)
+
+        # the remaining axes are in ascending wire order
+        kept = sorted(wires)
+        prob = np.transpose(prob, [kept.index(w) for w in wires])
+        return prob.reshape(-1)
+
+    def reduced_density_matrix(self, wires):
+        r"""Reduced density matrix of a set of wires in the current state.
+
+        The partial trace over the remaining wires is performed as a single
+        tensor contraction of the state with its conjugate. The results are
+        cached until the state changes, so that several expectations on the
+        same wires only read the full state once.
+
+        Args:
+          wires (Sequence[int]): subsystems to keep
+
+        Returns:
+          array: :math:`2^k\times 2^k` density matrix, where :math:`k` is the number of wires,
+          with the first wire in ``wires`` being the most significant qubit
+        """
+        wires = tuple(wires)
+        if len(set(wires)) != len(wires):
+            raise ValueError('The wires must be distinct.')
+
+        self._gather(wires)
+        if wires in self._rdm:
+            return self._rdm[wires]
+
+        n = len(self._wire_map)
+        axes = self._axes(wires)
+        psi = np.asarray(self._state).reshape([2]*n)
+        other = [w for w in range(n) if w not in axes]
+        rho = np.tensordot(psi, psi.conj(), axes=(other, other))
+
+        # the remaining axes are in ascending wire order
+        kept = sorted(axes)
+        perm = [kept.index(w) for w in axes]
+        k = len(wires)
+        rho = np.transpose(rho, perm + [k+i for i in perm]).reshape(2**k, 2**k)
+
+        self._rdm[wires] = rho
+        return rho
 
     def ev(self, A, wires):
         r"""Evaluates a one-qubit expectation in the current state.
@@ -370,6 +1306,7 @@ class DefaultQubit(Device):
         if A.shape != (2, 2):
             raise ValueError('2x2 matrix required.')
 
+        self._gather(wires)
         A = self.expand_one(A, wires)
         expectation = np.vdot(self._state, A @ self._state)
 
@@ -379,9 +1316,27 @@ class DefaultQubit(Device):
 
     def reset(self):
         """Reset the device"""
-        # init the state vector to |00..0>
-        self._state = np.zeros(2**self.num_wires, dtype=complex)
-        self._state[0] = 1
+        super().reset()
+        self._layer = None
+        self._probs = None
+        self._rdm = {}
+        self._shadow = None
+
+    def _zero_state(self, n):
+        state = np.zeros(2**n, dtype=complex)
+        state[0] = 1
+        return state
+
+    def _product(self, states):
+        state = np.ones(1, dtype=complex)
+        for part in states:
+            state = np.kron(state, part)
+        return state
+
+    def _gather(self, wires):
+        if super()._gather(wires):
+            self._probs = None
+            self._rdm = {}
 
     def expand_one(self, U, wires):
         r"""Expand a one-qubit operator into a full system operator.
@@ -397,9 +1352,9 @@ class DefaultQubit(Device):
             raise ValueError('2x2 matrix required.')
         if len(wires) != 1:
             raise ValueError('One target subsystem required.')
-        wires = wires[0]
+        wires = self._axes(wires)[0]
         before = 2**wires
-        after = 2**(self.num_wires-wires-1)
+        after = 2**(len(self._wire_map)-wires-1)
         U = np.kron(np.kron(np.eye(before), U), np.eye(after))
         return U
 
@@ -421,12 +1376,13 @@ class DefaultQubit(Device):
         if np.any(wires < 0) or np.any(wires >= self.num_wires) or wires[0] == wires[1]:
             raise ValueError('Bad target subsystems.')
 
+        wires = np.asarray(self._axes(wires))
         a = np.min(wires)
         b = np.max(wires)
         n_between = b-a-1  # number of qubits between a and b
         # dimensions of the untouched subsystems
         before = 2**a
-        after = 2**(self.num_wires-b-1)
+        after = 2**(len(self._wire_map)-b-1)
         between = 2**n_between
 
         U = np.kron(U, np.eye(between))
@@ -444,10 +1400,3 @@ class DefaultQubit(Device):
         U = np.kron(np.kron(np.eye(before), U), np.eye(after))
         return U
 
-    @property
-    def operations(self):
-        return set(self._operation_map.keys())
-
-    @property
-    def expectations(self):
-        return set(self._expectation_map.keys())
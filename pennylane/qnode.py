@@ -338,6 +338,98 @@ class QNode:
         #: dict[int->str]: map from free parameter index to the gradient method to be used with that parameter
         self.grad_method_for_par = {k: self._best_method(k) for k in self.variable_ops}
 
+        #: list[Operation], None: operations that can affect the returned expectation values,
+        #: or None if it depends on wires passed as keyword arguments
+        self.light_cone = None
+        if not any(isinstance(w, Variable) for op in self.ops for w in op._wires):
+            self.light_cone = self._light_cone(self.ev)
+
+    def _decompose(self, queue):
+        """Replace the operations not supported by the device with their decompositions.
+
+        Operations without a decomposition supported by the device are left
+        in place, for the device to report them as unsupported.
+
+        Args:
+            queue (Iterable[Operation]): operations
+
+        Returns:
+            list[Operation]: operations to execute on the device
+        """
+        supported = self.device.operations
+        # decompositions stay within the qubit or CV family of the operation
+        cv_device = any(isinstance(getattr(pennylane.ops, name, None), type)
+                        and issubclass(getattr(pennylane.ops, name), pennylane.operation.CV)
+                        for name in supported)
+        res = []
+        for op in queue:
+            if (op.name not in supported
+                    and isinstance(op, pennylane.operation.CV) == cv_device
+                    and type(op).decomposition is not pennylane.operation.Operation.decomposition):
+                try:
+                    decomp = self._decompose(op.decomposition(*op.parameters, wires=op.wires,
+                                                              **op.hyperparameters))
+                except NotImplementedError:
+                    decomp = None
+
+                if decomp is not None and all(o.name in supported for o in decomp):
+                    res.extend(decomp)
+                    continue
+            res.append(op)
+        return res
+
+    def _light_cone(self, obs):
+        """Operations in the backward light cone of the given observables.
+
+        Walking the queue backwards from the measured wires, an operation is kept
+        iff it acts on a wire that is already in the light cone, in which case all
+        of its wires join the light cone. The remaining operations cannot affect the
+        expectation values, and need not be executed.
+
+        Args:
+            obs (Iterable[Expectation]): observables
+
+        Returns:
+            list[Operation]: the operations in the light cone, in queue order
+        """
+        wires = set()
+        for ex in obs:
+            if not ex.wires:
+                # observable acting on all wires
+                return list(self.queue)
+            wires.update(ex.wires)
+
+        cone = []
+        for idx in reversed(range(len(self.queue))):
+            op = self.queue[idx]
+            if not op.wires:
+                # operation acting on all wires, every preceding one is in the light cone
+                return self.queue[:idx+1] + cone[::-1]
+
+            if wires.intersection(op.wires):
+                cone.append(op)
+                wires.update(op.wires)
+
+        return cone[::-1]
+
+    def _check_pruned(self, cone):
+        """Check that the device supports the operations outside of the light cone.
+
+        The device only validates the operations it executes, so a circuit
+        containing unsupported operations is rejected even if they cannot
+        affect the expectation values.
+
+        Args:
+            cone (list[Operation]): operations in the light cone of the observables
+
+        Raises:
+            DeviceError: if an operation outside of the light cone is not supported
+        """
+        kept = set(map(id, cone))
+        pruned = [op for op in self.queue if id(op) not in kept]
+        if pruned:
+            self.device.check_validity(self._decompose(pruned), [])
+
     def _op_successors(self, o_idx, only='G'):
         """Successors of the given operation in the quantum circuit.
 
@@ -446,6 +538,12 @@ class QNode:
         args = autograd.builtins.tuple(args)  # prevents autograd boxed arguments from going through to evaluate
         return self.evaluate(args, **kwargs)  # args as one tuple
 
+    def batch(self, *args, **kwargs):
+        """Wrapper for :meth:`~.QNode.evaluate_batch`."""
+        # pylint: disable=no-member
+        args = autograd.builtins.tuple(args)  # prevents autograd boxed arguments from going through to evaluate
+        return self.evaluate_batch(args, **kwargs)  # args as one tuple
+
     @ae.primitive
     def evaluate(self, args, **kwargs):
         """Evaluates the quantum function on the specified device.
@@ -481,6 +579,66 @@ class QNode:
         Variable.free_param_values = np.array(list(_flatten(args)))
         Variable.kwarg_values = keyword_values
 
+        ret = self._execute()
+        return self.output_type(ret)
+
+    @ae.primitive
+    def evaluate_batch(self, args, **kwargs):
+        """Evaluates the quantum function on the specified device for a batch of inputs.
+
+        Each array-like keyword argument has an additional leading dimension indexing the batch,
+        while the positional arguments and scalar keyword arguments are shared by all elements
+        of the batch.
+        On devices with the ``'batched'`` capability, operation parameters that depend on
+        the keyword arguments are passed to the device as arrays with one value per batch
+        element, and the whole batch is simulated in a single execution. Otherwise, the
+        batch elements are evaluated one after another.
+
+        Args:
+            args (tuple): input parameters to the quantum function
+
+        Returns:
+            array[float]: output expectation value(s) for each batch element,
+            with the batch as the leading dimension
+        """
+        # scalar keyword arguments are broadcast over the batch
+        batched = {k: v for k, v in kwargs.items() if np.ndim(v) > 0}
+        sizes = {len(v) for v in batched.values()}
+        if len(sizes) != 1:
+            raise QuantumFunctionError("Batches must be given as keyword arguments "
+                                       "with the same nonzero leading dimension.")
+        batch = [{**kwargs, **{k: v[b] for k, v in batched.items()}} for b in range(sizes.pop())]
+
+        if not self.device.capabilities().get('batched', False):
+            return np.array([self.evaluate(args, **b) for b in batch])
+
+        if not self.ops:
+            # construct the circuit
+            self.construct(args, **batch[0])
+
+        # temporarily store keyword arguments, flattened along the first axis
+        keyword_values = {}
+        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in self.keyword_defaults.items()})
+        keyword_values.update({k: np.array([list(_flatten(b[k])) for b in batch]).T for k in kwargs})
+
+        # temporarily store the free parameter values in the Variable class
+        Variable.free_param_values = np.array(list(_flatten(args)))
+        Variable.kwarg_values = keyword_values
+
+        ret = self._execute()
+        # results that do not depend on the batch are broadcast
+        ret = np.broadcast_to(np.reshape(ret, (self.output_dim, -1)), (self.output_dim, len(batch)))
+
+        if self.output_type is float:
+            return ret[0]
+        return ret.T
+
+    def _execute(self):
+        """Executes the circuit on the device, using the current values of the Variables.
+
+        Returns:
+            array[float]: output expectation values
+        """
         self.device.reset()
 
         # check that no wires are measured more than once
@@ -499,8 +657,13 @@ class QNode:
         for op in self.ops:
             check_op(op)
 
-        ret = self.device.execute(self.queue, self.ev)
-        return self.output_type(ret)
+        # only execute the operations that can affect the result
+        queue = self.light_cone
+        if queue is None:
+            queue = self._light_cone(self.ev)
+        self._check_pruned(queue)
+
+        return self.device.execute(self._decompose(queue), self.ev)
 
     def evaluate_obs(self, obs, args, **kwargs):
         """Evaluate the expectation values of the given observables.
@@ -524,7 +687,9 @@ class QNode:
         Variable.kwarg_values = keyword_values
 
         self.device.reset()
-        ret = self.device.execute(self.queue, obs)
+        queue = self._light_cone(obs)
+        self._check_pruned(queue)
+        ret = self.device.execute(self._decompose(queue), obs)
         return ret
 
     def jacobian(self, params, which=None, *, method='B', h=1e-7, order=1, **kwargs):
@@ -811,5 +976,37 @@ def QNode_vjp(ans, self, args, **kwargs):
     return gradient_product
 
 
+def QNode_batch_vjp(ans, self, args, **kwargs):
+    """Returns the vector Jacobian product operator for a batched QNode evaluation.
+
+    The Jacobians of the batch elements are computed one after another,
+    and summed after contraction with the corresponding rows of the output gradient.
+    """
+    # pylint: disable=unused-argument
+    def gradient_product(g):
+        """Vector Jacobian product operator.
+
+        Args:
+            g (array): vector or matrix multiplying the Jacobian
+                from the left (output side), with the batch as the leading dimension.
+
+        Returns:
+            nested Sequence[float]: vector-Jacobian product, arranged
+            into the nested structure of the QNode input arguments.
+        """
+        temp = 0
+        for b, g_b in enumerate(g):
+            jac = self.jacobian(args, **{k: v[b] for k, v in kwargs.items()})
+            g_b = np.reshape(g_b, -1)
+            temp = temp + g_b @ np.reshape(jac, (len(g_b), -1))
+
+        # restore the nested structure of the input args
+        temp = unflatten(np.reshape(temp, -1), args)
+        return temp
+
+    return gradient_product
+
+
 # define the vector-Jacobian product function for QNode.__call__()
 ae.defvjp(QNode.evaluate, QNode_vjp, argnums=[1])
+ae.defvjp(QNode.evaluate_batch, QNode_batch_vjp, argnums=[1])
@@ -30,11 +30,13 @@ across the PennyLane submodules.
     _flatten
     _unflatten
     unflatten
+    BoundedCache
 
 .. raw:: html
 
     <h3>Code details</h3>
 """
+from collections import OrderedDict
 from collections.abc import Iterable
 import numbers
 
@@ -100,3 +102,52 @@ def unflatten(flat, model):
     if len(tail) != 0:
         raise ValueError('Flattened iterable has more elements than the model.')
     return res
+
+
+class BoundedCache:
+    """Least recently used cache of computed values, holding at most ``maxsize`` entries.
+
+    Arrays stored in the cache, on their own or inside a tuple, are made read-only,
+    so that callers cannot modify the cached values in place.
+
+    Args:
+        maxsize (int): maximum number of entries
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+    def get(self, key, compute):
+        """Cached value for a key, computing and storing it if missing.
+
+        Args:
+            key (hashable): key of the value
+            compute (callable): function of no arguments returning the value;
+                if it raises an exception, nothing is stored
+
+        Returns:
+            object: the cached value
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = compute()
+        for a in value if isinstance(value, tuple) else (value,):
+            if isinstance(a, np.ndarray):
+                a.flags.writeable = False
+
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
@@ -47,7 +47,8 @@ info = {
     'entry_points': {
         'pennylane.plugins': [
             'default.qubit = pennylane.plugins:DefaultQubit',
-            'default.gaussian = pennylane.plugins:DefaultGaussian'
+            'default.gaussian = pennylane.plugins:DefaultGaussian',
+            'default.mixed = pennylane.plugins:DefaultMixed'
             ],
         },
     'description': 'PennyLane is a Python quantum machine learning library by Xanadu Inc.',
@@ -26,11 +26,11 @@ from defaults import pennylane as qml, BaseTest
 
 from pennylane import numpy as np
 
-from pennylane.plugins.default_gaussian import fock_prob
+from pennylane.plugins.default_gaussian import partitions, loop_hafnian, fock_prob, fock_probabilities
 
 from pennylane.plugins.default_gaussian import (rotation, squeezing, quadratic_phase,
                                                 beamsplitter, two_mode_squeezing,
-                                                controlled_addition, controlled_phase)
+                                                controlled_addition, controlled_phase, interferometer)
 from pennylane.plugins.default_gaussian import (vacuum_state, coherent_state,
                                                 squeezed_state, displaced_squeezed_state,
                                                 thermal_state)
@@ -87,6 +87,64 @@ class TestAuxillaryFunctions(BaseTest):
             res = fock_prob(self.mu, self.cov, e, hbar=self.hbar)
             self.assertAlmostEqual(res, self.probs[idx], delta=self.tol)
 
+    def test_fock_probabilities(self):
+        """Test fock_probabilities returns the correct photon-number distribution"""
+        res = fock_probabilities(self.mu, self.cov, 4, hbar=self.hbar)
+        self.assertEqual(res.shape, (4, 4))
+        for idx, e in enumerate(self.events):
+            self.assertAlmostEqual(res[e], self.probs[idx], delta=self.tol)
+
+        # pure states
+        r = 0.8
+        cov = np.diag([np.exp(-2*r), np.exp(2*r)])*self.hbar/2
+        res = fock_probabilities(np.array([0.3, -0.2]), cov, 8, hbar=self.hbar)
+        expected = [fock_prob(np.array([0.3, -0.2]), cov, [n], hbar=self.hbar) for n in range(8)]
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_loop_hafnian(self):
+        """Test loop_hafnian agrees with the sum over all matchings"""
+        A = np.array([[0.3, 1.2-0.4j, -0.5j], [1.2-0.4j, -0.7, 0.8+0.1j], [-0.5j, 0.8+0.1j, 0.2]])
+        D = np.array([0.4+0.3j, -1.1, 0.6j])
+
+        self.assertAlmostEqual(loop_hafnian(A, D, [0, 0, 0]), 1, delta=self.tol)
+        self.assertAlmostEqual(loop_hafnian(A[:2, :2]), A[0, 1], delta=self.tol)
+
+        for reps in ([1, 1, 1], [2, 1, 0], [1, 3, 2], [0, 4, 0]):
+            ind = [i for i, r in enumerate(reps) for _ in range(r)]
+            expected = np.sum([np.prod([D[i[0]] if len(i) == 1 else A[i] for i in p])
+                               for p in partitions(ind)])
+            self.assertAlmostEqual(loop_hafnian(A, D, reps), expected, delta=self.tol)
+
+            if len(ind) % 2 == 0:
+                expected = np.sum([np.prod([A[i] for i in p])
+                                   for p in partitions(ind, include_singles=False)])
+                self.assertAlmostEqual(loop_hafnian(A, reps=reps), expected, delta=self.tol)
+
+    def test_fock_prob_many_photons(self):
+        """Test fock_prob for events with many photons"""
+        # squeezed vacuum
+        r = 0.8
+        cov = np.diag([np.exp(-2*r), np.exp(2*r)])*self.hbar/2
+        n = 6
+        expected = fac(2*n)/(2**n*fac(n))**2*np.tanh(r)**(2*n)/np.cosh(r)
+        res = fock_prob(np.zeros(2), cov, [2*n], hbar=self.hbar)
+        self.assertAlmostEqual(res, expected, delta=self.tol)
+
+        # coherent state
+        alpha = 2.1-1.4j
+        mu = np.array([alpha.real, alpha.imag])*np.sqrt(2*self.hbar)
+        n = 11
+        expected = np.exp(-np.abs(alpha)**2)*np.abs(alpha)**(2*n)/fac(n)
+        res = fock_prob(mu, np.identity(2)*self.hbar/2, [n], hbar=self.hbar)
+        self.assertAlmostEqual(res, expected, delta=self.tol)
+
+        # thermal state
+        nbar = 1.3
+        cov = np.identity(4)*(2*nbar+1)*self.hbar/2
+        expected = (nbar**5/(nbar+1)**6)**2
+        res = fock_prob(np.zeros(4), cov, [5, 5], hbar=self.hbar)
+        self.assertAlmostEqual(res, expected, delta=self.tol)
+
 
 class TestGates(BaseTest):
     """Gate tests."""
@@ -386,6 +444,89 @@ class TestDefaultGaussianDevice(BaseTest):
             self.assertAllAlmostEqual(self.dev._state[0], expected_out[0], delta=self.tol)
             self.assertAllAlmostEqual(self.dev._state[1], expected_out[1], delta=self.tol)
 
+    def test_apply_symplectic(self):
+        """Test that symplectic matrices only update the affected modes"""
+        self.logTestName()
+        dev = DefaultGaussian(wires=4, shots=0, hbar=hbar)
+
+        A = np.random.random([8, 8])
+        mu = np.random.random(8)
+        cov = A @ A.T
+
+        for S, wires, expand in ((squeezing(0.3, 0.1), [2], lambda S, w: dev.expand_one(S, w[0])),
+                                 (beamsplitter(0.4, -0.2), [3, 1], dev.expand_two)):
+            dev._state = [mu.copy(), cov.copy()]
+            dev.apply_symplectic(S, wires)
+
+            S2 = expand(S, wires)
+            self.assertAllAlmostEqual(dev._state[0], S2 @ mu, delta=self.tol)
+            self.assertAllAlmostEqual(dev._state[1], S2 @ cov @ S2.T, delta=self.tol)
+
+        # user-supplied states are not modified by subsequent gates
+        mu2, cov2 = mu.copy(), cov.copy()
+        dev.apply('GaussianState', wires=list(range(4)), par=[mu2, cov2])
+        dev.apply('Squeezing', wires=[0], par=[0.3, 0.1])
+        self.assertAllEqual(mu2, mu)
+        self.assertAllEqual(cov2, cov)
+
+    def test_fusion(self):
+        """Test that consecutive gates on few modes are fused into a single affine map"""
+        self.logTestName()
+        dev = DefaultGaussian(wires=4, shots=0, hbar=hbar, fusion=2)
+        ref = DefaultGaussian(wires=4, shots=0, hbar=hbar, fusion=0)
+
+        ops = [('SqueezedState', [1], [0.3, 0.1]),
+               ('Rotation', [0], [0.5]),
+               ('Beamsplitter', [0, 1], [0.4, -0.2]),
+               ('Displacement', [1], [0.3, 0.7]),
+               ('Squeezing', [0], [0.2, 0.1]),
+               ('Beamsplitter', [2, 3], [0.1, 0.6]),
+               ('TwoModeSqueezing', [3, 2], [0.2, -0.4]),
+               ('Displacement', [3], [-0.2, 0.1]),
+               ('ControlledPhase', [1, 3], [0.5]),
+               ('Interferometer', [0, 1, 2], [block_diag(U, np.array([[1j]]))]),
+               ('Rotation', [2], [0.3])]
+
+        for op in ops:
+            dev.apply(*op)
+            ref.apply(*op)
+
+        # the last gates are pending
+        self.assertEqual(dev._fused[0], [2])
+        self.assertAllAlmostEqual(dev._state[0], ref._state[0], delta=self.tol)
+        self.assertAllAlmostEqual(dev._state[1], ref._state[1], delta=self.tol)
+        self.assertIsNone(dev._fused)
+
+        # gates on the same modes are fused into one block
+        dev.reset()
+        for op in ops[1:5]:
+            dev.apply(*op)
+        self.assertEqual(dev._fused[0], [0, 1])
+        self.assertAllEqual(dev._gaussian[0], np.zeros(8))
+
+        # expectations see the fused gates
+        ref.reset()
+        for op in ops[1:5]:
+            ref.apply(*op)
+        self.assertAlmostEqual(dev.expval('MeanPhoton', [1], []), ref.expval('MeanPhoton', [1], []), delta=self.tol)
+
+    def test_displacement_hbar(self):
+        """Test that fused, unfused and batched displacements agree for hbar != 2"""
+        self.logTestName()
+        h = 1.
+
+        def circuit(r, x=None):
+            """Test quantum function"""
+            qml.Squeezing(r, 0, wires=0)
+            qml.Displacement(x, 0, wires=0)
+            return qml.expval.X(0)
+
+        expected = 0.5*np.sqrt(2*h)
+        for fusion in (4, 0):
+            q = qml.QNode(circuit, qml.device('default.gaussian', wires=1, hbar=h, fusion=fusion))
+            self.assertAlmostEqual(q(0.1, x=0.5), expected, delta=self.tol)
+            self.assertAllAlmostEqual(q.batch(0.1, x=np.array([0.5, 0.5])), [[expected]]*2, delta=self.tol)
+
     def test_apply_errors(self):
         """Test that apply fails for incorrect state preparation"""
         self.logTestName()
@@ -398,10 +539,31 @@ class TestDefaultGaussianDevice(BaseTest):
             p = U
             self.dev.apply('Interferometer', wires=[0], par=[p])
 
-        with self.assertRaisesRegex(ValueError, 'Only 2-mode interferometers are currently supported.'):
-            p = U2
-            dev = DefaultGaussian(wires=4, shots=0, hbar=hbar)
-            self.dev.apply('Interferometer', wires=[0, 1, 2, 3], par=[p])
+    def test_interferometer(self):
+        """Test that interferometers act on any number of modes"""
+        self.logTestName()
+
+        # the beamsplitter is a two-mode interferometer
+        theta, phi = 0.432, -0.123
+        t = np.cos(theta)
+        r = np.exp(1j*phi)*np.sin(theta)
+        self.assertAllAlmostEqual(interferometer(np.array([[t, -r.conj()], [r, t]])),
+                                  beamsplitter(theta, phi), delta=self.tol)
+
+        # the symplectic matrix is built once per unitary
+        self.assertIs(interferometer(U2.copy()), interferometer(U2))
+
+        # mean photon numbers of coherent states transform as |U alpha|^2
+        dev = DefaultGaussian(wires=5, shots=0, hbar=hbar)
+        alpha = np.array([0.5, 0.1j, -0.3, 0.2+0.4j])
+        for w, a in zip([4, 0, 2, 1], alpha):
+            dev.apply('CoherentState', wires=[w], par=[a])
+        dev.apply('Interferometer', wires=[4, 0, 2, 1], par=[U2])
+
+        beta = U2 @ alpha
+        for w, b in zip([4, 0, 2, 1], beta):
+            self.assertAlmostEqual(dev.expval('MeanPhoton', [w], []), np.abs(b)**2, delta=self.tol)
+        self.assertAlmostEqual(dev.expval('MeanPhoton', [3], []), 0, delta=self.tol)
 
     def test_expectation(self):
         """Test that expectation values are calculated correctly"""
@@ -446,6 +608,30 @@ class TestDefaultGaussianDevice(BaseTest):
         expected = np.abs(np.sqrt(fac(2*n))/(2**n*fac(n))*(-np.tanh(r))**n/np.sqrt(np.cosh(r)))**2
         self.assertAlmostEqual(mean, expected, delta=self.tol)
 
+    def test_poly_xp(self):
+        """Test second-order quadrature polynomials on any subset of wires"""
+        self.logTestName()
+        dev = DefaultGaussian(wires=3, shots=0, hbar=hbar)
+        dev.apply('DisplacedSqueezedState', wires=[0], par=[0.5, 0.2, 0.3, 0.1])
+        dev.apply('CoherentState', wires=[2], par=[0.7, -0.4])
+        dev.apply('Beamsplitter', wires=[0, 2], par=[0.6, -0.3])
+        mu, cov = dev._state
+
+        # x_2^2 + p_0 + 0.5 x_2 p_0 + 0.5 p_0 x_2 - 2
+        Q = np.zeros((5, 5))
+        Q[1, 1] = 1
+        Q[0, 4] = 1
+        Q[1, 4] = Q[4, 1] = 0.5
+        Q[0, 0] = -2
+
+        expected = cov[2, 2] + mu[2]**2 + mu[3] + cov[2, 3] + mu[2]*mu[3] - 2
+        self.assertAlmostEqual(dev.expval('PolyXP', [2, 0], [Q]), expected, delta=self.tol)
+
+        # first-order polynomials
+        q = np.array([0.3, 0, 0, 1, -2])
+        expected = 0.3 + mu[0] - 2*mu[3]
+        self.assertAlmostEqual(dev.expval('PolyXP', [1, 0], [q]), expected, delta=self.tol)
+
     def test_reduced_state(self):
         """Test reduced state"""
         self.logTestName()
@@ -466,6 +652,75 @@ class TestDefaultGaussianDevice(BaseTest):
         self.assertAllAlmostEqual(res[0], expected[0], delta=self.tol)
         self.assertAllAlmostEqual(res[1], expected[1], delta=self.tol)
 
+    def test_fock_probabilities(self):
+        """Test the photon-number distribution of a subset of wires"""
+        self.logTestName()
+
+        self.dev.apply('DisplacedSqueezedState', wires=[0], par=[0.5, 0.2, 0.3, 0.1])
+        self.dev.apply('ThermalState', wires=[1], par=[0.4])
+        self.dev.apply('Beamsplitter', wires=[0, 1], par=[0.6, -0.3])
+
+        res = self.dev.fock_probabilities([1, 0], 3)
+        for n in np.ndindex(3, 3):
+            expected = self.dev.expval('NumberState', [1, 0], [np.array(n)])
+            self.assertAlmostEqual(res[n], expected, delta=self.tol)
+
+        res = self.dev.fock_probabilities(1, 5)
+        expected = [self.dev.expval('NumberState', [1], [np.array([n])]) for n in range(5)]
+        self.assertEqual(res.shape, (5,))
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_batched_apply(self):
+        """Test that batched parameters evolve a stack of states"""
+        self.logTestName()
+
+        r = np.array([0.1, 0.3, 0.5])
+        self.dev.apply('SqueezedState', wires=[0], par=[r, 0.2])
+        self.dev.apply('Beamsplitter', wires=[0, 1], par=[0.6, -0.3])
+        self.dev.apply('Displacement', wires=[1], par=[r, 0])
+        self.assertEqual(self.dev.batch_size, 3)
+        mu, cov = self.dev._state
+        self.assertEqual(mu.shape, (3, 4))
+        self.assertEqual(cov.shape, (3, 4, 4))
+        ev = self.dev.expval('MeanPhoton', [1], [])
+
+        for k, rk in enumerate(r):
+            dev = DefaultGaussian(wires=2, shots=0, hbar=hbar)
+            dev.apply('SqueezedState', wires=[0], par=[rk, 0.2])
+            dev.apply('Beamsplitter', wires=[0, 1], par=[0.6, -0.3])
+            dev.apply('Displacement', wires=[1], par=[rk, 0])
+            self.assertAllAlmostEqual(mu[k], dev._state[0], delta=self.tol)
+            self.assertAllAlmostEqual(cov[k], dev._state[1], delta=self.tol)
+            self.assertAlmostEqual(ev[k], dev.expval('MeanPhoton', [1], []), delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, 'batch size 2, but the state has batch size 3'):
+            self.dev.apply('Rotation', wires=[0], par=[np.array([0.1, 0.2])])
+
+        self.dev.reset()
+        self.assertIsNone(self.dev.batch_size)
+
+    def test_fock_cache(self):
+        """Test that Fock intermediates are shared until the state changes"""
+        self.logTestName()
+
+        self.dev.apply('SqueezedState', wires=[0], par=[0.3, 0.1])
+        self.dev.apply('Beamsplitter', wires=[0, 1], par=[0.6, -0.3])
+        p11 = self.dev.expval('NumberState', [0, 1], [np.array([1, 1])])
+        cached = self.dev._fock_cache[(0, 1)]
+
+        self.dev.expval('NumberState', [0, 1], [np.array([2, 0])])
+        self.dev.fock_probabilities([0, 1], 3)
+        self.assertIs(self.dev._fock_cache[(0, 1)], cached)
+        self.assertEqual(set(self.dev._fock_cache), {(0, 1)})
+
+        # applying a gate invalidates the cache
+        self.dev.apply('Displacement', wires=[1], par=[0.2, 0])
+        self.assertEqual(self.dev._fock_cache, {})
+        mu, cov = self.dev.reduced_state([0, 1])
+        self.assertAlmostEqual(self.dev.expval('NumberState', [0, 1], [np.array([1, 1])]),
+                               fock_prob(mu, cov, [1, 1], hbar=hbar), delta=self.tol)
+        self.assertNotAlmostEqual(p11, fock_prob(mu, cov, [1, 1], hbar=hbar), delta=self.tol)
+
 
 class TestDefaultGaussianIntegration(BaseTest):
     """Integration tests for default.gaussian. This test ensures it integrates
@@ -596,6 +851,106 @@ class TestDefaultGaussianIntegration(BaseTest):
 
         self.assertAlmostEqual(np.mean(runs), p*np.sqrt(2*hbar), delta=0.01)
 
+    def test_heisenberg_mode(self):
+        """Test that observables propagated through the gates agree with the evolved state"""
+        self.logTestName()
+        Q = np.array([[0.1, 0.2, 0.3, 0, 0.1],
+                      [0.2, 1, 0.5, 0.2, 0],
+                      [0.3, 0.5, -0.4, 0, 0.3],
+                      [0, 0.2, 0, 0.7, 0.1],
+                      [0.1, 0, 0.3, 0.1, 0.2]])
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.SqueezedState(0.3, 0.1, wires=0)
+            qml.CoherentState(0.4, 0.2, wires=2)
+            qml.ThermalState(0.5, wires=3)
+            qml.Displacement(x, 0.3, wires=1)
+            qml.Beamsplitter(0.4, 0.2, wires=[0, 1])
+            qml.Squeezing(0.2, x, wires=2)
+            qml.TwoModeSqueezing(0.3, 0.2, wires=[2, 3])
+            qml.Interferometer(U, wires=[1, 3])
+            qml.Rotation(0.7, wires=0)
+            qml.QuadraticPhase(0.2, wires=3)
+            qml.ControlledAddition(0.3, wires=[3, 4])
+            qml.ControlledPhase(0.3, wires=[0, 2])
+            return qml.expval.PolyXP(Q, wires=[0, 1]), qml.expval.X(2), qml.expval.MeanPhoton(3), \
+                qml.expval.Homodyne(0.3, wires=4)
+
+        dev = qml.device('default.gaussian', wires=5, heisenberg=True)
+        heisenberg = qml.QNode(circuit, dev)
+        schrodinger = qml.QNode(circuit, qml.device('default.gaussian', wires=5))
+        x = 0.543
+
+        self.assertAllAlmostEqual(heisenberg(x), schrodinger(x), delta=self.tol)
+        self.assertAllAlmostEqual(heisenberg.jacobian([x]), schrodinger.jacobian([x]), delta=self.tol)
+
+        # only the state preparations were applied to the state
+        self.assertAlmostEqual(dev._state[1][4, 4], hbar/2, delta=self.tol)
+        self.assertAlmostEqual(dev._state[1][0, 1], 0, delta=self.tol)
+
+        # observables without a Heisenberg representation use the evolved state
+        @qml.qnode(dev)
+        def fock(x):
+            """Test quantum function"""
+            qml.CoherentState(x, 0, wires=0)
+            qml.Beamsplitter(0.4, 0.2, wires=[0, 1])
+            return qml.expval.NumberState(np.array([1]), wires=1)
+
+        n = np.abs(x*np.sin(0.4))**2
+        self.assertAlmostEqual(fock(x), n*np.exp(-n), delta=self.tol)
+
+    def test_heisenberg_mode_batched(self):
+        """Test that batched circuits agree in the Heisenberg and Schrodinger pictures"""
+        self.logTestName()
+        Q = np.array([[0.1, 0.2, 0.3], [0.2, 1, 0.5], [0.3, 0.5, -0.4]])
+
+        def circuit(w, x=None):
+            """Test quantum function"""
+            qml.Displacement(x, 0.2, wires=0)
+            qml.Beamsplitter(w, 0.1, wires=[0, 1])
+            qml.Squeezing(x, w, wires=1)
+            qml.Rotation(0.3, wires=0)
+            return qml.expval.PolyXP(Q, wires=[0]), qml.expval.MeanPhoton(1)
+
+        heisenberg = qml.QNode(circuit, qml.device('default.gaussian', wires=2, heisenberg=True))
+        schrodinger = qml.QNode(circuit, qml.device('default.gaussian', wires=2))
+        x = np.array([0.1, 0.4, -0.3])
+
+        res = heisenberg.batch(0.5, x=x)
+        self.assertEqual(res.shape, (3, 2))
+        self.assertAllAlmostEqual(res, schrodinger.batch(0.5, x=x), delta=self.tol)
+
+    def test_quadrature_samples(self):
+        """Test that quadrature expectations are estimated from shared joint samples"""
+        self.logTestName()
+
+        shots = 10**4
+        dev = qml.device('default.gaussian', wires=2, shots=shots, seed=42)
+
+        @qml.qnode(dev)
+        def circuit(r, phi):
+            """Test quantum function"""
+            qml.Displacement(0.5, 0, wires=0)
+            qml.TwoModeSqueezing(r, 0, wires=[0, 1])
+            return qml.expval.X(0), qml.expval.Homodyne(phi, wires=1)
+
+        res = circuit(0.6, 0.2)
+        samples = dev.samples
+        self.assertEqual(samples.shape, (shots, 4))
+
+        # both expectations are computed from the same samples
+        expected = [np.mean(samples[:, 0]), np.mean(np.cos(0.2)*samples[:, 1]+np.sin(0.2)*samples[:, 3])]
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        # the samples are drawn from the joint distribution of the state
+        mu, cov = dev._state
+        self.assertAllAlmostEqual(np.mean(samples, axis=0), mu, delta=0.1)
+        self.assertAllAlmostEqual(np.cov(samples.T), cov, delta=0.2)
+
+        samples = dev.quadrature_samples(shots, heterodyne=True)
+        self.assertAllAlmostEqual(np.cov(samples.T), cov + np.identity(4)*hbar/2, delta=0.2)
+
     def test_supported_gates(self):
         """Test that all supported gates work correctly"""
         self.logTestName()
@@ -0,0 +1,298 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the :mod:`pennylane.plugin.DefaultMixed` device.
+"""
+# pylint: disable=protected-access,cell-var-from-loop
+import unittest
+import logging as log
+
+from pennylane import numpy as np
+
+from defaults import pennylane as qml, BaseTest
+from pennylane.plugins.default_qubit import I, X, Z, CNOT
+from pennylane.plugins.default_mixed import (amplitude_damping, phase_damping, depolarizing,
+                                             DefaultMixed)
+
+log.getLogger('defaults')
+
+
+H = np.array([[1.02789352, 1.61296440-0.3498192j],
+              [1.61296440+0.3498192j, 1.23920938+0j]])
+
+
+class TestChannels(BaseTest):
+    """Tests the Kraus representations of the channels."""
+
+    def test_trace_preserving(self):
+        """Test that the Kraus operators of the channels are complete"""
+        self.logTestName()
+
+        for fn in (amplitude_damping, phase_damping, depolarizing):
+            for p in (0, 0.23, 1):
+                K = fn(p)
+                res = np.einsum('kji,kjl->il', K.conj(), K)
+                self.assertAllAlmostEqual(res, I, delta=self.tol)
+
+    def test_invalid_probability(self):
+        """Test that channel parameters outside [0, 1] raise an exception"""
+        self.logTestName()
+
+        for fn in (amplitude_damping, phase_damping, depolarizing):
+            with self.assertRaisesRegex(ValueError, "must be a probability"):
+                fn(1.2)
+            with self.assertRaisesRegex(ValueError, "must be a probability"):
+                fn(-0.1)
+
+
+class TestDefaultMixedDevice(BaseTest):
+    """Test the default mixed device."""
+
+    def setUp(self):
+        self.dev = DefaultMixed(wires=3)
+        self.dev.reset()
+
+        psi = np.random.random(8) + 1j*np.random.random(8)
+        psi /= np.linalg.norm(psi)
+        self.rho = np.outer(psi, psi.conj())
+        self.dev._state = self.rho.reshape([2]*6)
+
+    def test_operation_map(self):
+        """Test that default mixed device supports all PennyLane qubit gates and channels."""
+        self.assertEqual(set(qml.ops.qubit.__all__) | set(qml.ops.channel.__all__),
+                         set(self.dev._operation_map))
+
+    def test_apply_channel(self):
+        """Test that channels act on the correct axes of the density matrix"""
+        self.logTestName()
+
+        K = amplitude_damping(0.3)
+        self.dev.apply_channel(K, [1])
+        expected = sum(np.kron(np.kron(I, k), I) @ self.rho @ np.kron(np.kron(I, k), I).conj().T for k in K)
+        self.assertAllAlmostEqual(self.dev._state.reshape(8, 8), expected, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "must be 2x2 matrices"):
+            self.dev.apply_channel(np.array([CNOT]), [0])
+
+        with self.assertRaisesRegex(ValueError, "wires must be distinct"):
+            self.dev.apply_channel(np.array([CNOT]), [0, 0])
+
+    def test_apply_gate(self):
+        """Test that unitary gates are applied as U rho U^dagger"""
+        self.logTestName()
+
+        self.dev.apply('CNOT', [2, 0], [])
+        # CNOT with control 2 and target 0
+        P0 = np.diag([1, 0])
+        P1 = np.diag([0, 1])
+        U = np.kron(np.kron(I, I), P0) + np.kron(np.kron(X, I), P1)
+        expected = U @ self.rho @ U.conj().T
+        self.assertAllAlmostEqual(self.dev._state.reshape(8, 8), expected, delta=self.tol)
+
+    def test_reduced_density_matrix(self):
+        """Test the reduced density matrix of subsets of wires"""
+        self.logTestName()
+
+        rho = self.rho.reshape([2]*6)
+        rho_1 = np.einsum('iajibj->ab', rho)
+        rho_20 = np.einsum('aibcid->badc', rho).reshape(4, 4)
+
+        self.assertAllAlmostEqual(self.dev.reduced_density_matrix([1]), rho_1, delta=self.tol)
+        self.assertAllAlmostEqual(self.dev.reduced_density_matrix([2, 0]), rho_20, delta=self.tol)
+
+        self.assertAlmostEqual(self.dev.ev(Z, [1]), np.trace(rho_1 @ Z).real, delta=self.tol)
+        with self.assertRaisesRegex(ValueError, "2x2 matrix required"):
+            self.dev.ev(CNOT, [1])
+
+
+class TestDefaultMixedIntegration(BaseTest):
+    """Integration tests for default.mixed. This test ensures it integrates
+    properly with the PennyLane interface, in particular QNode."""
+
+    def test_load_default_mixed_device(self):
+        """Test that the default plugin loads correctly"""
+        self.logTestName()
+
+        dev = qml.device('default.mixed', wires=2)
+        self.assertEqual(dev.num_wires, 2)
+        self.assertEqual(dev.shots, 0)
+        self.assertEqual(dev.short_name, 'default.mixed')
+
+    def test_agrees_with_default_qubit(self):
+        """Test that noiseless circuits agree with default.qubit"""
+        self.logTestName()
+        x = np.array([0.1, -0.5, 1.2])
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.BasisState(np.array([1, 0]), wires=[0, 1])
+            qml.Rot(*x, wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(x[1], wires=1)
+            qml.CZ(wires=[1, 0])
+            return qml.expval.PauliX(0), qml.expval.Hermitian(H, 1)
+
+        mixed = qml.QNode(circuit, qml.device('default.mixed', wires=2))
+        pure = qml.QNode(circuit, qml.device('default.qubit', wires=2))
+        self.assertAllAlmostEqual(mixed(x), pure(x), delta=self.tol)
+
+    def test_amplitude_embedding(self):
+        """Test that amplitude embedding agrees with default.qubit"""
+        self.logTestName()
+        x = 0.543
+
+        def circuit(x, features=None):
+            """Test quantum function"""
+            qml.RY(x, wires=0)
+            qml.AmplitudeEmbedding(features, wires=[2, 1])
+            qml.CNOT(wires=[1, 0])
+            return qml.expval.PauliX(0), qml.expval.PauliY(1), qml.expval.PauliZ(2)
+
+        features = np.array([0.2, -1j, 0.5])
+        mixed = qml.QNode(circuit, qml.device('default.mixed', wires=3))
+        pure = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        self.assertAllAlmostEqual(mixed(x, features=features), pure(x, features=features), delta=self.tol)
+
+    def test_diagonal_cost(self):
+        """Test that cost layers agree with default.qubit"""
+        self.logTestName()
+        coeffs = np.array([0.5, -1.2])
+        terms = np.array([[1, 1], [0, 1]])
+
+        def circuit(gamma):
+            """Test quantum function"""
+            qml.Hadamard(wires=0)
+            qml.RY(0.3, wires=1)
+            qml.DiagonalCost(gamma, coeffs, terms, wires=[1, 0])
+            qml.Hadamard(wires=0)
+            return qml.expval.PauliZ(0), qml.expval.PauliY(1)
+
+        mixed = qml.QNode(circuit, qml.device('default.mixed', wires=3))
+        pure = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        self.assertAllAlmostEqual(mixed(0.432), pure(0.432), delta=self.tol)
+
+    def test_pauli_rot(self):
+        """Test that Pauli rotations agree with default.qubit"""
+        self.logTestName()
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.Hadamard(wires=2)
+            qml.PauliRot(x, wires=[2, 0], pauli_word='XY')
+            return qml.expval.PauliZ(0), qml.expval.PauliY(2)
+
+        mixed = qml.QNode(circuit, qml.device('default.mixed', wires=3))
+        pure = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        self.assertAllAlmostEqual(mixed(0.432), pure(0.432), delta=self.tol)
+
+    def test_noisy_channels(self):
+        """Test the expectation values of noisy circuits"""
+        self.logTestName()
+        dev = qml.device('default.mixed', wires=2)
+        a = 0.543
+        g = 0.21
+
+        @qml.qnode(dev)
+        def circuit(a, g):
+            """Test quantum function"""
+            qml.RX(a, wires=0)
+            qml.AmplitudeDamping(g, wires=0)
+            qml.RY(a, wires=1)
+            qml.PhaseDamping(g, wires=1)
+            return qml.expval.PauliZ(0), qml.expval.PauliX(1)
+
+        expected = [1 - 2*(1-g)*np.sin(a/2)**2, np.sqrt(1-g)*np.sin(a)]
+        self.assertAllAlmostEqual(circuit(a, g), expected, delta=self.tol)
+
+        @qml.qnode(dev)
+        def depolarized(a, p):
+            """Test quantum function"""
+            qml.RY(a, wires=0)
+            qml.DepolarizingChannel(p, wires=0)
+            return qml.expval.PauliX(0)
+
+        self.assertAlmostEqual(depolarized(a, g), (1-4*g/3)*np.sin(a), delta=self.tol)
+
+    def test_unused_wires(self):
+        """Test that only the wires used by a circuit are allocated"""
+        self.logTestName()
+        dev = qml.device('default.mixed', wires=12)
+        a = 0.543
+
+        @qml.qnode(dev)
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x, wires=9)
+            qml.PhaseDamping(0.5, wires=9)
+            return qml.expval.PauliZ(9)
+
+        self.assertAlmostEqual(circuit(a), np.cos(a), delta=self.tol)
+        self.assertEqual(dev._state.shape, (2, 2))
+
+    def test_independent_subsystems(self):
+        """Test that the density matrix covers all independently simulated parts"""
+        self.logTestName()
+        a = 0.543
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            qml.CNOT(wires=[0, 2])
+            qml.Hadamard(wires=1)
+            qml.AmplitudeDamping(0.3, wires=1)
+            return qml.expval.PauliZ(2), qml.expval.PauliX(1)
+
+        mixed = qml.device('default.mixed', wires=3)
+        joint = qml.device('default.mixed', wires=3)
+        qml.QNode(circuit, mixed)(a)
+
+        # the same circuit, with entangled parts
+        def entangled(x):
+            """Test quantum function"""
+            qml.CNOT(wires=[1, 2])
+            qml.CNOT(wires=[1, 2])
+            return circuit(x)
+
+        qml.QNode(entangled, joint)(a)
+        for wires in ([1], [2, 0], [1, 2], [2, 1, 0]):
+            self.assertAllAlmostEqual(mixed.reduced_density_matrix(wires),
+                                      joint.reduced_density_matrix(wires), delta=self.tol)
+
+    def test_gradient(self):
+        """Test that gradients with respect to channel parameters are computed"""
+        self.logTestName()
+        dev = qml.device('default.mixed', wires=1)
+        a = 0.543
+
+        @qml.qnode(dev)
+        def circuit(g):
+            """Test quantum function"""
+            qml.RX(a, wires=0)
+            qml.AmplitudeDamping(g, wires=0)
+            return qml.expval.PauliZ(0)
+
+        grad = qml.grad(circuit, argnum=0)
+        self.assertAlmostEqual(grad(0.3), 2*np.sin(a/2)**2, delta=1e-5)
+
+
+if __name__ == '__main__':
+    print('Testing PennyLane version ' + qml.version() + ', default.mixed plugin.')
+    # run the tests in this file
+    suite = unittest.TestSuite()
+    for t in (TestChannels,
+              TestDefaultMixedDevice,
+              TestDefaultMixedIntegration):
+        ttt = unittest.TestLoader().loadTestsFromTestCase(t)
+        suite.addTests(ttt)
+    unittest.TextTestRunner().run(suite)
@@ -19,12 +19,17 @@ import unittest
 import inspect
 import logging as log
 
+from scipy.linalg import expm
+
 from pennylane import numpy as np
 
 from defaults import pennylane as qml, BaseTest
 from pennylane.plugins.default_qubit import (spectral_decomposition_qubit,
                                              I, X, Z, CNOT, Rphi, Rotx, Roty, Rotz, Rot3,
-                                             unitary, hermitian, DefaultQubit)
+                                             unitary, hermitian, amplitudes, cost_diagonal, pauli_map, pauli_rot,
+                                             eigensystem, time_evolution,
+                                             active_wires, subsystems, circuit_key,
+                                             _validated, DefaultQubit)
 
 log.getLogger('defaults')
 
@@ -162,6 +167,52 @@ class TestStateFunctions(BaseTest):
         with self.assertRaisesRegex(ValueError, "must be unitary"):
             unitary(U3)
 
+        # invalid matrices are not remembered
+        with self.assertRaisesRegex(ValueError, "must be unitary"):
+            unitary(U3)
+
+    def test_validation_cache(self):
+        """Test that matrices are only validated once, unless validation is disabled."""
+        self.logTestName()
+        checks = []
+
+        def check(A):
+            """records the validations"""
+            checks.append(A)
+
+        A = np.random.random([4, 4])
+        self.assertIs(_validated('test', A, check), A)
+        _validated('test', A.copy(), check)
+        self.assertEqual(len(checks), 1)
+
+        # different contents or checks are validated again
+        A[0, 0] += 1
+        _validated('test', A, check)
+        _validated('other', A, check)
+        self.assertEqual(len(checks), 3)
+
+        # the device can trust the matrices
+        U3 = U.copy()
+        U3[0, 0] += 0.5
+        dev = qml.device('default.qubit', wires=1, validate=False)
+        self.assertAllEqual(dev._get_operator_matrix('QubitUnitary', [U3]), U3)
+        with self.assertRaisesRegex(ValueError, "must be unitary"):
+            qml.device('default.qubit', wires=1)._get_operator_matrix('QubitUnitary', [U3])
+
+    def test_cached_arrays_read_only(self):
+        """Test that cached arrays cannot be modified by the caller"""
+        self.logTestName()
+        expected = np.array([0.5, -0.5, -0.5, 0.5])
+        D = cost_diagonal([0.5], [[1, 1]])
+        with self.assertRaisesRegex(ValueError, "read-only"):
+            D[:] = 0
+        self.assertAllEqual(cost_diagonal([0.5], [[1, 1]]), expected)
+
+        w, _ = eigensystem(H)
+        with self.assertRaisesRegex(ValueError, "read-only"):
+            w *= 2
+        self.assertAllAlmostEqual(eigensystem(H)[0], np.linalg.eigvalsh(H), delta=self.tol)
+
     def test_hermitian(self):
         """Test that the Hermitian function produces the correct output."""
         self.logTestName()
@@ -184,6 +235,104 @@ class TestStateFunctions(BaseTest):
         with self.assertRaisesRegex(ValueError, "must be Hermitian"):
             hermitian(H2)
 
+    def test_amplitudes(self):
+        """Test the normalization and padding of amplitude embedding features"""
+        self.logTestName()
+
+        res = amplitudes(np.array([3, 4j]), 2)
+        self.assertAllAlmostEqual(res, np.array([0.6, 0.8j, 0, 0]), delta=self.tol)
+        self.assertEqual(res.dtype, np.complex128)
+
+        # normalized complex states of the right length are not copied
+        state = np.array([0.6, 0.8j, 0, 0])
+        self.assertIs(amplitudes(state, 2), state)
+
+        with self.assertRaisesRegex(ValueError, "at most 2\\*\\*len\\(wires\\) features"):
+            amplitudes(np.ones(3), 1)
+
+        with self.assertRaisesRegex(ValueError, "nonzero feature vector"):
+            amplitudes(np.zeros(3), 2)
+
+    def test_cost_diagonal(self):
+        """Test the diagonal of a Pauli-Z cost Hamiltonian"""
+        self.logTestName()
+        coeffs = np.array([0.5, -1.2, 0.3])
+        terms = np.array([[1, 1, 0], [0, 1, 1], [0, 0, 1]])
+
+        C = 0.5*np.kron(np.kron(Z, Z), I) - 1.2*np.kron(I, np.kron(Z, Z)) + 0.3*np.kron(I, np.kron(I, Z))
+        self.assertAllAlmostEqual(cost_diagonal(coeffs, terms), np.diag(C), delta=self.tol)
+
+        # the diagonal is computed once per structure
+        self.assertIs(cost_diagonal(coeffs, terms.copy()), cost_diagonal(coeffs, terms))
+
+        with self.assertRaisesRegex(ValueError, "one coefficient per row"):
+            cost_diagonal(coeffs[:2], terms)
+
+    def test_eigensystem(self):
+        """Test the cached eigendecomposition of Hermitian generators"""
+        self.logTestName()
+
+        w, V = eigensystem(H)
+        self.assertAllAlmostEqual((V * w) @ V.conj().T, H, delta=self.tol)
+        self.assertIs(eigensystem(H.copy())[1], V)
+        self.assertAllAlmostEqual(time_evolution(0.432, H), expm(-0.432j*H), delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "must be a Hermitian matrix"):
+            eigensystem(U)
+
+    def test_pauli_map(self):
+        """Test the index maps and phases of multi-qubit Pauli operators"""
+        self.logTestName()
+        psi = np.random.random(16) + 1j*np.random.random(16)
+        paulis = {'I': I, 'X': X, 'Y': np.array([[0, -1j], [1j, 0]]), 'Z': Z}
+
+        for word in ('XYZ', 'YIY', 'ZZI', 'III'):
+            # acting on wires 3, 0, 1 of a 4 qubit state
+            idx, phase = pauli_map(word, [3, 0, 1], 4)
+            P = np.kron(np.kron(paulis[word[1]], paulis[word[2]]), np.kron(I, paulis[word[0]]))
+            self.assertAllAlmostEqual(phase*psi[idx], P @ psi, delta=self.tol)
+
+    def test_active_wires(self):
+        """Test the wires acted on by a circuit"""
+        self.logTestName()
+        queue = [qml.RX(0.1, wires=3, do_queue=False), qml.CNOT(wires=[5, 1], do_queue=False)]
+        ev = [qml.expval.PauliZ(7, do_queue=False)]
+        self.assertEqual(active_wires(queue, ev, 10), [1, 3, 5, 7])
+
+        # state preparations act on all wires
+        queue.append(qml.BasisState(np.array([0, 1]), wires=[0, 1], do_queue=False))
+        self.assertEqual(active_wires(queue, ev, 10), list(range(10)))
+
+    def test_subsystems(self):
+        """Test the splitting of circuits into independent parts"""
+        self.logTestName()
+        queue = [qml.RX(0.1, wires=0, do_queue=False),
+                 qml.CNOT(wires=[2, 3], do_queue=False),
+                 qml.RY(0.2, wires=4, do_queue=False),
+                 qml.CNOT(wires=[0, 1], do_queue=False),
+                 qml.RZ(0.3, wires=2, do_queue=False)]
+        ev = [qml.expval.PauliZ(3, do_queue=False),
+              qml.expval.PauliX(1, do_queue=False),
+              qml.expval.PauliZ(0, do_queue=False)]
+
+        parts = subsystems(queue, ev)
+        self.assertEqual(len(parts), 2)
+
+        # the part acting on wire 4 has no expectations and is dropped
+        ops, exps, idx = parts[0]
+        self.assertEqual(ops, [queue[1], queue[4]])
+        self.assertEqual(exps, [ev[0]])
+        self.assertEqual(idx, [0])
+
+        ops, exps, idx = parts[1]
+        self.assertEqual(ops, [queue[0], queue[3]])
+        self.assertEqual(exps, [ev[1], ev[2]])
+        self.assertEqual(idx, [1, 2])
+
+        # state preparations act on all wires
+        queue.append(qml.BasisState(np.array([0, 1]), wires=[0, 1], do_queue=False))
+        self.assertEqual(subsystems(queue, ev), [(queue, ev, [0, 1, 2])])
+
 
 class TestDefaultQubitDevice(BaseTest):
     """Test the default qubit device. The test ensures that the device is properly
@@ -289,6 +438,8 @@ class TestDefaultQubitDevice(BaseTest):
                 p = [U]
             elif name == 'Hermitian':
                 p = [H]
+            elif name == 'TimeEvolution':
+                p = [0.432423, H]
 
             res = self.dev._get_operator_matrix(name, p)
 
@@ -331,10 +482,29 @@ class TestDefaultQubitDevice(BaseTest):
                 elif gate_name == 'BasisState':
                     p = [np.array([1, 1])]
                     expected_out = np.array([0, 0, 0, 1])
+                elif gate_name == 'AmplitudeEmbedding':
+                    p = [np.array([1, 1j, 1])]
+                    w = [0, 1]
+                    expected_out = np.array([1, 1j, 1, 0])/np.sqrt(3)
+                elif gate_name == 'TimeEvolution':
+                    p = [0.432423, H]
+                    w = [1]
+                    expected_out = np.kron(np.array([1, 0]), expm(-1j*p[0]*H) @ np.array([1, 0]))
+                elif gate_name == 'DiagonalCost':
+                    p = [0.432423, np.array([0.5, -1.2]), np.array([[1, 1], [0, 1]])]
+                    w = [0, 1]
+                    # the state |00> has C = 0.5 - 1.2
+                    expected_out = np.exp(-1j*p[0]*(0.5-1.2))*np.array([1, 0, 0, 0])
 
             elif op.par_domain == 'N':
                 # the parameter is an integer
                 p = [1, 3, 4][:op.num_params]
+            elif gate_name == 'PauliRot':
+                p = [0.432423]
+                w = [0, 1]
+                self.dev._pauli_words = ['YX']
+                # Y X |00> = i|11>
+                expected_out = np.array([np.cos(p[0]/2), 0, 0, np.sin(p[0]/2)])
             else:
                 # the parameter is a float
                 p = [0.432423, -0.12312, 0.324][:op.num_params]
@@ -432,6 +602,89 @@ class TestDefaultQubitDevice(BaseTest):
                 self.assertEqual(len(l.records), 1)
                 self.assertIn('Nonvanishing imaginary part', l.output[0])
 
+        # diagonal matrices of the wrong size are rejected as well
+        with self.assertRaisesRegex(ValueError, "2x2 matrix required"):
+            self.dev.expval('Hermitian', [0], [np.diag([1, 2, 3, 4])])
+
+    def test_apply_layer(self):
+        """Test that a layer of one-qubit gates is applied in a single pass"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3)
+        dev.reset()
+
+        psi = np.random.random(8) + 1j*np.random.random(8)
+        psi /= np.linalg.norm(psi)
+        dev._state = psi.copy()
+
+        A = Rotx(0.432)
+        B = Rot3(0.1, -0.2, 0.3)
+        dev.apply_layer([A, B], [2, 0])
+
+        expected = np.kron(np.kron(B, I), A) @ psi
+        self.assertAllAlmostEqual(dev._state, expected, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "wires of a layer must be distinct"):
+            dev.apply_layer([A, B], [1, 1])
+
+        with self.assertRaisesRegex(ValueError, "2x2 matrix required"):
+            dev.apply_layer([U2], [0])
+
+    def test_marginal_prob(self):
+        """Test the marginal probabilities of subsets of wires"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3)
+        dev.reset()
+
+        psi = np.random.random(8) + 1j*np.random.random(8)
+        psi /= np.linalg.norm(psi)
+        dev._state = psi
+        prob = (np.abs(psi)**2).reshape([2, 2, 2])
+
+        self.assertAllAlmostEqual(dev.marginal_prob([1]), prob.sum(axis=(0, 2)), delta=self.tol)
+        self.assertAllAlmostEqual(dev.marginal_prob([0, 2]), prob.sum(axis=1).ravel(), delta=self.tol)
+        self.assertAllAlmostEqual(dev.marginal_prob([2, 0]), prob.sum(axis=1).T.ravel(), delta=self.tol)
+        self.assertAllAlmostEqual(dev.marginal_prob([0, 1, 2]), prob.ravel(), delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "wires must be distinct"):
+            dev.marginal_prob([1, 1])
+
+        # diagonal expectations are evaluated using the marginal distribution
+        for w in range(3):
+            expected = dev.ev(Z, [w])
+            self.assertAlmostEqual(dev.expval('PauliZ', [w], []), expected, delta=self.tol)
+
+    def test_reduced_density_matrix(self):
+        """Test the reduced density matrix of subsets of wires"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3)
+        dev.reset()
+
+        psi = np.random.random(8) + 1j*np.random.random(8)
+        psi /= np.linalg.norm(psi)
+        dev._state = psi
+        rho = np.outer(psi, psi.conj()).reshape([2]*6)
+
+        # partial traces
+        rho_0 = np.einsum('aijbij->ab', rho)
+        rho_21 = np.einsum('iabicd->badc', rho).reshape(4, 4)
+
+        self.assertAllAlmostEqual(dev.reduced_density_matrix([0]), rho_0, delta=self.tol)
+        self.assertAllAlmostEqual(dev.reduced_density_matrix([2, 1]), rho_21, delta=self.tol)
+        self.assertAllAlmostEqual(dev.reduced_density_matrix([0, 1, 2]), rho.reshape(8, 8), delta=self.tol)
+
+        # results are cached until the state changes
+        self.assertIs(dev.reduced_density_matrix([0]), dev.reduced_density_matrix([0]))
+        dev.apply('PauliX', [0], [])
+        self.assertAllAlmostEqual(dev.reduced_density_matrix([0]), X @ rho_0 @ X, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "wires must be distinct"):
+            dev.reduced_density_matrix([1, 1])
+
+        # non-diagonal expectations are evaluated using the reduced density matrix
+        for w in range(3):
+            expected = dev.ev(H, [w])
+            self.assertAlmostEqual(dev.expval('Hermitian', [w], [H]), expected, delta=self.tol)
+
 
 class TestDefaultQubitIntegration(BaseTest):
     """Integration tests for default.qubit. This test ensures it integrates
@@ -527,6 +780,373 @@ class TestDefaultQubitIntegration(BaseTest):
         expected = -np.sin(p)
         self.assertAlmostEqual(circuit(p), expected, delta=self.tol)
 
+    def test_single_qubit_layers(self):
+        """Test that buffered layers of one-qubit gates agree with sequential application"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=3)
+        x = np.array([0.1, -0.5, 1.2])
+
+        @qml.qnode(dev)
+        def circuit(x):
+            """Test quantum function"""
+            for w in range(3):
+                qml.RX(x[w], wires=w)
+            qml.RY(x[0], wires=0)
+            qml.CNOT(wires=[0, 1])
+            for w in range(3):
+                qml.RZ(x[w], wires=w)
+            qml.RY(x[2], wires=2)
+            return qml.expval.PauliY(0), qml.expval.PauliX(2)
+
+        layer = lambda *m: np.kron(np.kron(m[0], m[1]), m[2])
+        state = np.zeros(8)
+        state[0] = 1
+        state = layer(*[Rotx(t) for t in x]) @ state
+        state = layer(Roty(x[0]), I, I) @ state
+        state = np.kron(CNOT, I) @ state
+        state = layer(*[Rotz(t) for t in x]) @ state
+        state = layer(I, I, Roty(x[2])) @ state
+
+        Y = np.array([[0, -1j], [1j, 0]])
+        expected = [np.vdot(state, layer(Y, I, I) @ state).real,
+                    np.vdot(state, layer(I, I, X) @ state).real]
+        self.assertAllAlmostEqual(circuit(x), expected, delta=self.tol)
+
+    def test_unused_wires(self):
+        """Test that only the wires used by a circuit are allocated"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=20)
+        a = 0.543
+
+        @qml.qnode(dev)
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x, wires=17)
+            qml.CNOT(wires=[17, 3])
+            return qml.expval.PauliZ(3), qml.expval.PauliY(17)
+
+        self.assertAllAlmostEqual(circuit(a), [np.cos(a), 0], delta=self.tol)
+        self.assertEqual(dev._state.shape, (4,))
+        self.assertAllAlmostEqual(dev.marginal_prob([17]), [np.cos(a/2)**2, np.sin(a/2)**2], delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "Wire 5 is not allocated"):
+            dev.marginal_prob([5])
+
+    def test_independent_subsystems(self):
+        """Test that circuits with independent parts are simulated correctly"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=4)
+        x = np.array([0.1, -0.5, 1.2])
+
+        @qml.qnode(dev)
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x[0], wires=0)
+            qml.RY(x[1], wires=2)
+            qml.CNOT(wires=[0, 3])
+            qml.RX(x[2], wires=1)
+            return qml.expval.PauliZ(2), qml.expval.PauliZ(3), qml.expval.PauliY(1)
+
+        expected = [np.cos(x[1]), np.cos(x[0]), -np.sin(x[2])]
+        self.assertAllAlmostEqual(circuit(x), expected, delta=self.tol)
+
+        # each part is simulated separately, the last one acting on wire 1
+        self.assertEqual(dev._state.shape, (2,))
+
+        # the state accessors cover the wires of all of the parts
+        self.assertAllAlmostEqual(dev.marginal_prob([3, 1]),
+                                  np.kron([np.cos(x[0]/2)**2, np.sin(x[0]/2)**2],
+                                          [np.cos(x[2]/2)**2, np.sin(x[2]/2)**2]), delta=self.tol)
+        rho = dev.reduced_density_matrix([2, 0, 3])
+        psi2 = Roty(x[1]) @ np.array([1, 0])
+        psi03 = CNOT @ np.kron(Rotx(x[0]) @ np.array([1, 0]), np.array([1, 0]))
+        psi = np.kron(psi2, psi03)
+        self.assertAllAlmostEqual(rho, np.outer(psi, psi.conj()), delta=self.tol)
+        self.assertAlmostEqual(dev.ev(Z, [2]), np.cos(x[1]), delta=self.tol)
+
+    def test_cached_columns(self):
+        """Test that output states of basis state inputs are cached for fixed weights"""
+        self.logTestName()
+        weights = np.array([0.1, -0.5, 1.2, 0.3])
+
+        def circuit(weights, x=None):
+            """Test quantum function"""
+            qml.BasisState(x, wires=[0, 1, 2])
+            qml.Rot(*weights[:3], wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(weights[3], wires=2)
+            qml.CNOT(wires=[2, 0])
+            return qml.expval.PauliZ(0), qml.expval.PauliX(2)
+
+        dev = qml.device('default.qubit', wires=3, cache=True)
+        cached = qml.QNode(circuit, dev)
+        plain = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+
+        data = np.array([[0, 1, 1], [1, 0, 0], [0, 1, 1], [1, 1, 0], [1, 0, 0]])
+        for x in data:
+            self.assertAllAlmostEqual(cached(weights, x=x), plain(weights, x=x), delta=self.tol)
+
+        # one simulation per distinct input
+        self.assertEqual(len(dev._columns), 3)
+
+        # changing the weights invalidates the cache
+        weights[3] = 0.7
+        self.assertAllAlmostEqual(cached(weights, x=data[0]), plain(weights, x=data[0]), delta=self.tol)
+        self.assertEqual(len(dev._columns), 1)
+
+        # only the most recently used columns are kept
+        dev._max_cached_amplitudes = 2*2**3
+        for x in data:
+            self.assertAllAlmostEqual(cached(weights, x=x), plain(weights, x=x), delta=self.tol)
+        self.assertEqual(list(dev._columns), [6, 4])
+
+        # invalid inputs are still rejected
+        with self.assertRaisesRegex(ValueError, "BasisState parameter must be an array"):
+            cached(weights, x=np.array([0, 2, 1]))
+
+    def test_diagonal_cost(self):
+        """Test cost layers"""
+        self.logTestName()
+        coeffs = np.array([0.5, -1.2, 0.3])
+        terms = np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]])
+
+        def circuit(gamma, beta):
+            """QAOA layer on wires 2, 0 and 3"""
+            for w in (0, 2, 3):
+                qml.Hadamard(wires=w)
+            qml.DiagonalCost(gamma, coeffs, terms, wires=[2, 0, 3])
+            for w in (0, 2, 3):
+                qml.RX(beta, wires=w)
+            return qml.expval.PauliZ(0), qml.expval.PauliY(2), qml.expval.PauliX(3)
+
+        gamma, beta = 0.432, -0.123
+
+        # reference state, with wire order 2, 0, 3
+        H_C = 0.5*np.kron(np.kron(Z, Z), I) - 1.2*np.kron(I, np.kron(Z, Z)) + 0.3*np.kron(Z, np.kron(I, Z))
+        psi = np.exp(-1j*gamma*np.diag(H_C)) * np.ones(8)/np.sqrt(8)
+        R = Rotx(beta)
+        psi = np.kron(np.kron(R, R), R) @ psi
+        Y = np.array([[0, -1j], [1j, 0]])
+        expected = [np.vdot(psi, np.kron(np.kron(A, B), C) @ psi).real
+                    for A, B, C in ((I, Z, I), (Y, I, I), (I, I, X))]
+
+        qnode = qml.QNode(circuit, qml.device('default.qubit', wires=4))
+        self.assertAllAlmostEqual(qnode(gamma, beta), expected, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "one column of terms per wire"):
+            dev = qml.device('default.qubit', wires=2)
+            dev.reset()
+            dev.apply('DiagonalCost', [0, 1], [0.5, coeffs, terms])
+
+    def test_time_evolution(self):
+        """Test time evolution and its gradient"""
+        self.logTestName()
+        A = np.kron(H, Z) + np.kron(X, np.identity(2))
+
+        def circuit(t):
+            """Test quantum function"""
+            qml.Hadamard(wires=0)
+            qml.TimeEvolution(t, A, wires=[2, 0])
+            return qml.expval.PauliZ(0), qml.expval.PauliX(2)
+
+        def reference(t):
+            """reference expectation values, with wire order 2, 0"""
+            psi = expm(-1j*t*A) @ np.array([1, 1, 0, 0])/np.sqrt(2)
+            return np.array([np.vdot(psi, np.kron(np.identity(2), Z) @ psi).real,
+                             np.vdot(psi, np.kron(X, np.identity(2)) @ psi).real])
+
+        qnode = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        for t in (0.1, 0.5, 1.3):
+            self.assertAllAlmostEqual(qnode(t), reference(t), delta=self.tol)
+
+        grad = qnode.jacobian([0.5])
+        self.assertAllAlmostEqual(grad[:, 0], (reference(0.5+1e-7)-reference(0.5-1e-7))/2e-7, delta=1e-5)
+
+    def test_pauli_rot(self):
+        """Test Pauli rotations and their gradients"""
+        self.logTestName()
+        x = np.array([0.432, -0.123])
+        Y = np.array([[0, -1j], [1j, 0]])
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x[1], wires=0)
+            qml.Hadamard(wires=3)
+            qml.PauliRot(x[0], wires=[3, 0, 1], pauli_word='XYZ')
+            qml.PauliRot(x[1], wires=[1, 2], pauli_word='YI')
+            return qml.expval.PauliZ(0), qml.expval.PauliY(1), qml.expval.PauliX(3)
+
+        def full(A, B, C, D):
+            """operator on wires 0, 1, 2 and 3"""
+            return np.kron(np.kron(A, B), np.kron(C, D))
+
+        def reference(x):
+            """reference expectation values"""
+            psi = np.zeros(16)
+            psi[0] = 1
+            psi = full(Rotx(x[1]), I, I, np.array([[1, 1], [1, -1]])/np.sqrt(2)) @ psi
+            psi = (np.cos(x[0]/2)*np.identity(16) - 1j*np.sin(x[0]/2)*full(Y, Z, I, X)) @ psi
+            psi = (np.cos(x[1]/2)*np.identity(16) - 1j*np.sin(x[1]/2)*full(I, Y, I, I)) @ psi
+            return np.array([np.vdot(psi, A @ psi).real
+                             for A in (full(Z, I, I, I), full(I, Y, I, I), full(I, I, I, X))])
+
+        qnode = qml.QNode(circuit, qml.device('default.qubit', wires=4))
+        self.assertAllAlmostEqual(qnode(x), reference(x), delta=self.tol)
+
+        # parameter-shift gradient
+        grad = qnode.jacobian([x], method='A')
+        h = 1e-7
+        for k in range(2):
+            shift = np.zeros(2)
+            shift[k] = h
+            self.assertAllAlmostEqual(grad[:, k], (reference(x+shift)-reference(x-shift))/(2*h), delta=1e-6)
+
+        # the Pauli word is an attribute, not a parameter
+        ops = [qml.PauliRot(0.5, wires=[0, 1], pauli_word=p, do_queue=False) for p in ('XY', 'YX')]
+        self.assertEqual(ops[0].parameters, [0.5])
+        self.assertNotEqual(circuit_key(ops[:1]), circuit_key(ops[1:]))
+        self.assertEqual(len(qml.PauliRot.decomposition(0.5, wires=[0, 1], pauli_word='XY')),
+                         len(ops[0].decomposition(0.5, wires=[0, 1], **ops[0].hyperparameters)))
+
+        # the Pauli word is not guessed outside of execute
+        with self.assertRaisesRegex(ValueError, "provides its Pauli word"):
+            DefaultQubit(wires=2).apply('PauliRot', [0, 1], [0.5])
+
+        with self.assertRaisesRegex(ValueError, "one of I, X, Y or Z per wire"):
+            qml.PauliRot(0.5, wires=[0, 1], pauli_word='XA', do_queue=False)
+
+        with self.assertRaisesRegex(ValueError, "one of I, X, Y or Z per wire"):
+            qml.PauliRot(0.5, wires=[0, 1], pauli_word='X', do_queue=False)
+
+    def test_classical_shadow(self):
+        """Test that expectation values are estimated from a single classical shadow"""
+        self.logTestName()
+        x = np.array([0.432, -0.123, 0.8])
+        shots = 3000
+
+        dev = qml.device('default.qubit', wires=3, shots=shots, seed=42, shadows=True)
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x[0], wires=0)
+            qml.RY(x[1], wires=1)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(x[2], wires=2)
+            return qml.expval.PauliZ(0), qml.expval.PauliX(1), qml.expval.Hermitian(H, 2)
+
+        exact = qml.QNode(circuit, qml.device('default.qubit', wires=3))(x)
+        res = qml.QNode(circuit, dev)(x)
+        self.assertAllAlmostEqual(res, exact, delta=0.25)
+
+        # one batch of snapshots, stored as small integer arrays
+        bases, bits = dev._shadow
+        self.assertEqual(bases.shape, (shots, 3))
+        self.assertEqual(bits.dtype, np.uint8)
+        self.assertTrue(set(np.unique(bases)) <= {0, 1, 2})
+
+        # further Pauli words are estimated from the same record
+        psi = np.kron(np.kron(np.identity(2), np.identity(2)), Roty(x[2])) @ \
+            np.kron(CNOT @ np.kron(Rotx(x[0]) @ [1, 0], Roty(x[1]) @ [1, 0]), [1, 0])
+        ZZ = np.kron(np.kron(Z, Z), np.identity(2))
+        self.assertAlmostEqual(dev.shadow_expval('ZZ', [0, 1]), np.vdot(psi, ZZ @ psi).real, delta=0.2)
+        self.assertAlmostEqual(dev.shadow_expval('II', [0, 2]), 1, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "No classical shadow"):
+            dev.reset()
+            dev.shadow_expval('Z', [0])
+
+    def test_amplitude_embedding(self):
+        """Test amplitude embedding on a subset of the wires"""
+        self.logTestName()
+        x = 0.543
+        features = np.array([1, -1j, 2])
+
+        def circuit(x, features=None):
+            """Test quantum function"""
+            qml.RX(x, wires=1)
+            qml.AmplitudeEmbedding(features, wires=[2, 0])
+            qml.CNOT(wires=[0, 1])
+            return qml.expval.PauliZ(0), qml.expval.PauliY(1), qml.expval.PauliX(2)
+
+        # reference state
+        a = features / np.linalg.norm(features)
+        psi = np.zeros([2, 2, 2], dtype=complex)
+        psi[0, :, 0] = a[0]*(Rotx(x) @ np.array([1, 0]))
+        psi[1, :, 0] = a[1]*(Rotx(x) @ np.array([1, 0]))
+        psi[0, :, 1] = a[2]*(Rotx(x) @ np.array([1, 0]))
+        psi = np.kron(CNOT, I) @ psi.ravel()
+        Y = np.array([[0, -1j], [1j, 0]])
+        expected = [np.vdot(psi, np.kron(np.kron(A, B), C) @ psi).real
+                    for A, B, C in ((Z, I, I), (I, Y, I), (I, I, X))]
+
+        res = qml.QNode(circuit, qml.device('default.qubit', wires=3))(x, features=features)
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_decompositions(self):
+        """Test that operations applied by decomposition agree with their native application"""
+        self.logTestName()
+        x = 0.543
+        cases = [
+            (qml.AmplitudeEmbedding, [np.array([1, -1j, 2])], [2, 0], {}),
+            (qml.DiagonalCost, [0.432, np.array([0.5, -1.2, 0.3]), np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]])],
+             [2, 0, 3], {}),
+            (qml.TimeEvolution, [0.5, np.kron(H, Z) + np.kron(X, np.identity(2))], [2, 0], {}),
+            (qml.PauliRot, [0.432], [3, 0, 1], {'pauli_word': 'XYZ'}),
+        ]
+
+        for op, par, wires, kwargs in cases:
+            with self.subTest(op=op.__name__):
+
+                class NoNative(DefaultQubit):
+                    """default.qubit applying the operation by decomposition"""
+                    @property
+                    def operations(self):
+                        return super().operations - {op.__name__}
+
+                def circuit(x):
+                    """Test quantum function"""
+                    if op is not qml.AmplitudeEmbedding:
+                        # the embedding expects its wires in the zero state
+                        for w in range(4):
+                            qml.Hadamard(wires=w)
+                            qml.RX(x*(w+1), wires=w)
+                    op(*par, wires=wires, **kwargs)
+                    qml.CNOT(wires=[0, 1])
+                    return qml.expval.PauliX(0), qml.expval.PauliY(1), qml.expval.PauliY(2), qml.expval.PauliX(3)
+
+                native = qml.QNode(circuit, qml.device('default.qubit', wires=4))
+                decomposed = qml.QNode(circuit, NoNative(wires=4))
+                self.assertAllAlmostEqual(decomposed(x), native(x), delta=self.tol)
+                self.assertAllAlmostEqual(decomposed.jacobian([x]), native.jacobian([x]), delta=self.tol)
+
+        class NoEmbedding(DefaultQubit):
+            """default.qubit without native amplitude embedding"""
+            @property
+            def operations(self):
+                return super().operations - {'AmplitudeEmbedding'}
+
+        def embedding(features=None):
+            """Test quantum function"""
+            qml.AmplitudeEmbedding(features, wires=[2, 0])
+            return qml.expval.PauliZ(0)
+
+        # invalid features are reported as such, not as an unsupported operation
+        with self.assertRaisesRegex(ValueError, r"at most 2\*\*len\(wires\) features"):
+            qml.QNode(embedding, NoEmbedding(wires=3))(features=np.ones(5))
+
+    def test_state_vector_phases(self):
+        """Test that QubitStateVector preserves complex amplitudes"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=1)
+
+        @qml.qnode(dev)
+        def circuit(state=None):
+            """Test quantum function"""
+            qml.QubitStateVector(state, wires=[0])
+            return qml.expval.PauliY(0)
+
+        self.assertAlmostEqual(circuit(state=np.array([1, 1j])/np.sqrt(2)), 1, delta=self.tol)
+
     def test_qubit_identity(self):
         """Test that the default qubit plugin provides correct result for the Identiy expectation"""
         self.logTestName()
@@ -609,6 +1229,14 @@ class TestDefaultQubitIntegration(BaseTest):
                     out_state = x[0]
                 elif g == 'BasisState':
                     out_state = np.array([0, 0, 0, 1])
+                elif g == 'AmplitudeEmbedding':
+                    out_state = np.kron(x[0], np.array([1, 0]))
+                elif g == 'DiagonalCost':
+                    out_state = np.array([np.exp(-1j*x[0]*x[1][0]), 0, 0, 0])
+                elif g == 'TimeEvolution':
+                    out_state = np.kron(O @ np.array([1, 0]), np.array([1, 0]))
+                elif g == 'PauliRot':
+                    out_state = np.kron(pauli_rot(*x) @ np.array([1, 0]), np.array([1, 0]))
                 else:
                     out_state = O @ dev._state
 
@@ -621,6 +1249,22 @@ class TestDefaultQubitIntegration(BaseTest):
             elif g == 'BasisState':
                 p = np.array([1, 1])
                 self.assertAllEqual(circuit(p), reference(p))
+            elif g == 'AmplitudeEmbedding':
+                p = np.array([0.6, 0.8])
+                self.assertAllEqual(circuit(p), reference(p))
+            elif g == 'DiagonalCost':
+                p = np.array([0.8])
+                self.assertAllEqual(circuit(a, p, np.array([[1]])), reference(a, p))
+            elif g == 'TimeEvolution':
+                self.assertAlmostEqual(circuit(a, H), reference(a, H), delta=self.tol)
+            elif g == 'PauliRot':
+                @qml.qnode(dev)
+                def circuit(x):
+                    """Reference quantum function"""
+                    op(x, wires=wires, pauli_word='Y')
+                    return qml.expval.PauliX(0)
+
+                self.assertAlmostEqual(circuit(a), reference(a, 'Y'), delta=self.tol)
             elif g == 'QubitUnitary':
                 self.assertAllEqual(circuit(U), reference(U))
             elif op.num_params == 1:
@@ -671,7 +1315,9 @@ class TestDefaultQubitIntegration(BaseTest):
             if op.num_params == 0:
                 self.assertAllEqual(circuit(), reference())
             elif g == 'Hermitian':
-                self.assertAllEqual(circuit(H), reference(H))
+                # evaluated via the reduced density matrix, which
+                # rounds differently from the full-state reference
+                self.assertAllAlmostEqual(circuit(H), reference(H), delta=self.tol)
 
 
 if __name__ == '__main__':
@@ -30,7 +30,7 @@ from pennylane.plugins import DefaultQubit
 class DeviceTest(BaseTest):
     """Device tests."""
     def setUp(self):
-        self.default_devices = ['default.qubit', 'default.gaussian']
+        self.default_devices = ['default.qubit', 'default.gaussian', 'default.mixed']
 
         self.dev = {}
 
@@ -152,6 +152,33 @@ class DeviceTest(BaseTest):
 
             self.assertTrue(isinstance(expval, np.ndarray))
 
+    def test_seed(self):
+        """check that seeded devices sample reproducibly, and spawned seeds independently"""
+        self.logTestName()
+
+        for name in self.default_devices:
+            dev = qml.device(name, wires=2, shots=1000, seed=42)
+            if name == 'default.gaussian':
+                queue = [qml.Displacement(0.5, 0, wires=0, do_queue=False)]
+                expval = [qml.expval.X(0, do_queue=False)]
+            else:
+                queue = [qml.RX(1.5, wires=0, do_queue=False)]
+                expval = [qml.expval.PauliZ(0, do_queue=False)]
+
+            res = [dev.execute(queue, expval) for _ in range(5)]
+
+            # same seed, same samples
+            dev2 = qml.device(name, wires=2, shots=1000, seed=42)
+            self.assertAllEqual(res, [dev2.execute(queue, expval) for _ in range(5)])
+
+            # child seeds yield different streams
+            s1, s2 = dev.spawn(2)
+            dev1 = qml.device(name, wires=2, shots=1000, seed=s1)
+            dev2 = qml.device(name, wires=2, shots=1000, seed=s2)
+            res1 = [dev1.execute(queue, expval) for _ in range(5)]
+            res2 = [dev2.execute(queue, expval) for _ in range(5)]
+            self.assertFalse(np.allclose(res1, res2))
+
     def test_validity(self):
         """check that execution throws error on unsupported operations/expectations"""
         self.logTestName()
@@ -186,6 +186,9 @@ class BasicTest(BaseTest):
         for cls in pennylane.ops.cv.all_ops:
             op_test(cls)
 
+        for cls in pennylane.ops.channel.all_ops:
+            op_test(cls)
+
         for cls in pennylane.expval.qubit.all_ops:
             op_test(cls)
 
@@ -23,7 +23,8 @@ from pennylane import numpy as np
 from scipy.linalg import block_diag
 
 from defaults import pennylane as qml, BaseTest
-from pennylane.ops import cv
+from pennylane.ops import cv, qubit
+from pennylane.plugins import DefaultQubit
 
 
 log.getLogger('defaults')
@@ -163,11 +164,54 @@ class TestNonGaussian(BaseTest):
                 op_ = op(*[0.1] * op.num_params, [0] * op.num_wires, do_queue=False)
                 op_.heisenberg_tr(op.num_wires)
 
+
+class TestDecompositions(BaseTest):
+    """Tests for the decompositions of operations."""
+
+    def test_amplitude_embedding_decomposition(self):
+        """Tests that the AmplitudeEmbedding decomposition prepares the state up to a global phase."""
+        self.logTestName()
+
+        for n in range(1, 5):
+            for features in (np.random.randn(max(2**n - 1, 2)),
+                             np.random.randn(2**n) + 1j*np.random.randn(2**n)):
+                ops = qubit.AmplitudeEmbedding.decomposition(features, wires=list(range(n))[::-1])
+                self.assertTrue(all(op.name in ('RY', 'RZ', 'CNOT') for op in ops))
+
+                dev = DefaultQubit(wires=n)
+                dev.reset()
+                for op in ops:
+                    dev.apply(op.name, op.wires, op.parameters)
+
+                expected = np.zeros(2**n, dtype=complex)
+                expected[:len(features)] = features
+                expected = expected.reshape([2]*n).T.ravel()  # reversed wire order
+                expected /= np.linalg.norm(expected)
+                self.assertAlmostEqual(np.abs(np.vdot(expected, dev._state)), 1, delta=self.tol)
+
+    def test_amplitude_embedding_decomposition_errors(self):
+        """Tests that invalid features raise an exception."""
+        self.logTestName()
+
+        with self.assertRaisesRegex(ValueError, "at most 2\\*\\*len\\(wires\\) features"):
+            qubit.AmplitudeEmbedding.decomposition(np.ones(5), wires=[0, 1])
+
+        with self.assertRaisesRegex(ValueError, "nonzero feature vector"):
+            qubit.AmplitudeEmbedding.decomposition(np.zeros(2), wires=[0])
+
+    def test_no_decomposition(self):
+        """Tests that operations without a decomposition raise NotImplementedError."""
+        self.logTestName()
+
+        with self.assertRaises(NotImplementedError):
+            qubit.CNOT.decomposition(wires=[0, 1])
+
+
 if __name__ == '__main__':
     print('Testing PennyLane version ' + qml.version() + ', default.gaussian plugin.')
     # run the tests in this file
     suite = unittest.TestSuite()
-    for t in (TestHeisenberg,TestNonGaussian):
+    for t in (TestHeisenberg, TestNonGaussian, TestDecompositions):
         ttt = unittest.TestLoader().loadTestsFromTestCase(t)
         suite.addTests(ttt)
     unittest.TextTestRunner().run(suite)
@@ -129,6 +129,58 @@ class BasicTest(BaseTest):
         #self.assertTrue(q.ops[5] not in successors)
 
 
+    def test_light_cone(self):
+        "Tests that only the operations in the backward light cone of the observables are executed."
+        self.logTestName()
+
+        def qf(x, q=1):
+            qml.RX(x, [0])
+            qml.CNOT([0, 1])
+            qml.RY(0.4, [0])
+            qml.RZ(-0.2, [1])
+            qml.RX(0.3, [q])
+            return qml.expval.PauliZ(1)
+
+        q = qml.QNode(qf, self.dev2)
+        x = 0.543
+        self.assertAlmostEqual(q(x), np.cos(x)*np.cos(0.3), delta=self.tol)
+
+        # the light cone depends on the keyword argument q
+        self.assertIsNone(q.light_cone)
+
+        cone = q._light_cone(q.ev)
+        self.assertEqual([op.name for op in cone], ['RX', 'CNOT', 'RZ', 'RX'])
+
+        # observables measuring wire 0 only
+        ev = [qml.expval.PauliX(0, do_queue=False)]
+        cone = q._light_cone(ev)
+        self.assertEqual([op.name for op in cone], ['RX', 'CNOT', 'RY'])
+
+        # the result is unaffected by pruning
+        self.assertAlmostEqual(q(x, q=0), np.cos(x), delta=self.tol)
+
+        def qf2(x):
+            qml.RX(x, [0])
+            qml.RY(0.4, [1])
+            return qml.expval.PauliZ(1)
+
+        q = qml.QNode(qf2, self.dev2)
+        q.construct([1.0])
+        self.assertEqual([op.name for op in q.light_cone], ['RY'])
+
+        # unsupported operations are rejected even outside of the light cone
+        class NoRX(qml.plugins.DefaultQubit):
+            """default.qubit without RX gates"""
+            @property
+            def operations(self):
+                return super().operations - {'RX'}
+
+        q = qml.QNode(qf2, NoRX(wires=2))
+        with self.assertRaisesRegex(DeviceError, 'Gate RX not supported'):
+            q(x)
+        with self.assertRaisesRegex(DeviceError, 'Gate RX not supported'):
+            q.evaluate_obs(q.ev, [x])
+
     def test_qnode_fail(self):
         "Tests that QNode initialization failures correctly raise exceptions."
         self.logTestName()
@@ -529,6 +581,52 @@ class BasicTest(BaseTest):
         c = classnode(0., x=np.pi)
         self.assertAllAlmostEqual(c, [1., -1.], delta=self.tol)
 
+    def test_evaluate_batch(self):
+        "Tests that batches of keyword arguments are evaluated one by one on unbatched devices."
+        self.logTestName()
+
+        def circuit(w, x=None):
+            qml.RX(w, [0])
+            qml.RX(x, [1])
+            return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+        circuit = qml.QNode(circuit, self.dev2)
+
+        x = np.array([0., 0.4, np.pi])
+        res = circuit.batch(0.1, x=x)
+        expected = np.array([circuit(0.1, x=xi) for xi in x])
+        self.assertEqual(res.shape, (3, 2))
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        with self.assertRaisesRegex(QuantumFunctionError, 'same nonzero leading dimension'):
+            circuit.batch(0.1)
+
+        # scalar keyword arguments are shared by the batch
+        def circuit(w, x=None, y=None):
+            qml.RX(w, [0])
+            qml.RX(x, [1])
+            qml.RY(y, [0])
+            return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+        circuit = qml.QNode(circuit, self.dev2)
+        res = circuit.batch(0.1, x=x, y=0.3)
+        expected = np.array([circuit(0.1, x=xi, y=0.3) for xi in x])
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        with self.assertRaisesRegex(QuantumFunctionError, 'same nonzero leading dimension'):
+            circuit.batch(0.1, x=0.4, y=0.3)
+
+        # also on devices simulating the whole batch at once
+        def circuit(w, x=None, y=None):
+            qml.Displacement(x, 0., wires=0)
+            qml.Squeezing(w, y, wires=0)
+            return qml.expval.X(0)
+
+        circuit = qml.QNode(circuit, qml.device('default.gaussian', wires=1))
+        res = circuit.batch(0.1, x=x, y=0.3)
+        expected = np.array([circuit(0.1, x=xi, y=0.3) for xi in x])
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
 
 class GradientTest(BaseTest):
     """Qnode gradient tests.
@@ -811,6 +909,31 @@ class GradientTest(BaseTest):
         self.assertAllAlmostEqual(res1, res2, delta=self.tol)
 
 
+    def test_evaluate_batch_gradient(self):
+        "Tests that batched evaluations can be differentiated w.r.t. the positional arguments."
+        self.logTestName()
+
+        def circuit(w, x=None):
+            qml.Displacement(x, 0., wires=0)
+            qml.Squeezing(w[0], w[1], wires=0)
+            qml.Rotation(x, wires=0)
+            return qml.expval.X(0)
+
+        circuit = qml.QNode(circuit, qml.device('default.gaussian', wires=1))
+        x = np.array([0.2, -0.5, 0.7])
+        w = np.array([0.3, 0.1])
+
+        def cost(w):
+            """Batched cost function"""
+            return np.sum(circuit.batch(w, x=x)**2)
+
+        def cost_ref(w):
+            """Unbatched cost function"""
+            return sum(circuit(w, x=xi)**2 for xi in x)
+
+        self.assertAlmostEqual(cost(w), cost_ref(w), delta=self.tol)
+        self.assertAllAlmostEqual(autograd.grad(cost)(w), autograd.grad(cost_ref)(w), delta=self.tol)
+
     def test_differentiate_all_positional(self):
         "Tests that all positional arguments are differentiated."
         self.logTestName()